@@ -0,0 +1,66 @@
+# benchmarks/bench_arima_orders.py
+#
+# ARIMA fitting time per series over successive monthly refits (as in a
+# nightly run or a walk-forward backtest): cold stepwise auto_arima every
+# time (train_arima), cold full grid search every time (search_arima), and
+# the order cache, which searches once and then only refits coefficients.
+#
+#   python benchmarks/bench_arima_orders.py [--series 3] [--refits 6] [--n-jobs -1]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from src.arima_orders   import ArimaOrderCache
+from src.model_training import search_arima, train_arima
+
+
+def synthetic_series(n: int, seed: int) -> np.ndarray:
+    """
+    Monthly complaint-like counts: trend, yearly seasonality, noise.
+    """
+    rng = np.random.default_rng(seed)
+    t   = np.arange(n)
+    return (rng.uniform(200, 2000) + rng.uniform(0, 10) * t
+            + rng.uniform(20, 200) * np.sin(2 * np.pi * t / 12) + rng.normal(0, 30, n))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--series', type=int, default=3)
+    parser.add_argument('--months', type=int, default=96)
+    parser.add_argument('--refits', type=int, default=6)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    data    = [synthetic_series(args.months, seed) for seed in range(args.series)]
+    lengths = range(args.months - args.refits + 1, args.months + 1)
+    paths   = {
+        'stepwise (current)': lambda key, y: train_arima(y),
+        'grid search':        lambda key, y: search_arima(y, n_jobs=args.n_jobs),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArimaOrderCache(tmp, n_jobs=args.n_jobs)
+        paths['order cache'] = cache.fit
+
+        print(f"{'path':<20} {'total s':>9} {'first fit s':>12} {'later fits s':>13}")
+        for label, fit in paths.items():
+            first, later = [], []
+            for key, y in enumerate(data):
+                for i, n in enumerate(lengths):
+                    t0 = time.perf_counter()
+                    fit(key, y[:n])
+                    (first if i == 0 else later).append(time.perf_counter() - t0)
+            print(f"{label:<20} {sum(first) + sum(later):>9.2f} "
+                  f"{np.mean(first):>12.2f} {np.mean(later):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_change_points.py
+#
+# Change-point search time for the current ruptures PELT path vs. the
+# linear-cost modes of detect_change_points on synthetic daily series.
+# Quadratic paths are skipped above --max-quadratic points (rbf builds an
+# n x n kernel matrix: 100k points would need ~80 GB).
+#
+#   python benchmarks/bench_change_points.py [--sizes 1000 10000 100000]
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from src.anomaly_detection import detect_change_points
+
+# (label, method, model, quadratic in n?)
+PATHS = [
+    ('pelt rbf (current)', 'pelt',   'rbf',    True),
+    ('pelt l2 (ruptures)', 'pelt',   'l2',     True),
+    ('linear l2',          'linear', 'l2',     False),
+    ('linear normal',      'linear', 'normal', False),
+    ('binseg l2',          'binseg', 'l2',     False),
+]
+PENALTY = {'rbf': 10, 'l2': 5000, 'normal': 50}
+
+
+def synthetic_series(n: int, seed: int = 0) -> pd.Series:
+    """
+    Complaint-like counts with a level shift every ~n/10 points (hourly
+    index: 100k daily timestamps would overflow datetime64[ns]).
+    """
+    rng    = np.random.default_rng(seed)
+    levels = np.repeat(rng.uniform(80, 200, 10), int(np.ceil(n / 10)))[:n]
+    values = rng.normal(levels, 5)
+    return pd.Series(values, index=pd.date_range("2000-01-01", periods=n, freq="h"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--max-quadratic', type=int, default=10_000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    print(f"{'points':>8} {'path':<20} {'seconds':>9} {'breaks':>7}")
+    for n in args.sizes:
+        series = synthetic_series(n)
+        for label, method, model, quadratic in PATHS:
+            limit = args.max_quadratic // (2 if model == 'rbf' else 1)
+            if quadratic and n > limit:
+                print(f"{n:>8} {label:<20} {'skipped':>9} {'-':>7}")
+                continue
+            t0   = time.perf_counter()
+            bkps = detect_change_points(series, model=model, pen=PENALTY[model], method=method)
+            print(f"{n:>8} {label:<20} {time.perf_counter() - t0:>9.3f} {len(bkps):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_lag_matrix.py
+#
+# Time and peak memory of building LSTM training windows with
+# series_to_supervised (+ the reshape train_lstm does) vs. the strided
+# lag_matrix view, for long series and panels of many series.
+#
+#   python benchmarks/bench_lag_matrix.py [--length 100000 1000000] [--lags 3 30 100]
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from src.feature_engineering import lag_matrix, series_to_supervised
+
+
+def via_supervised(panel: np.ndarray, lags: int):
+    out = []
+    for values in panel:
+        sup = series_to_supervised(pd.Series(values), lags=lags).values
+        out.append((sup[:, 1:].reshape(-1, lags, 1), sup[:, 0]))
+    return out
+
+
+def via_lag_matrix(panel: np.ndarray, lags: int):
+    return lag_matrix(panel, lags)
+
+
+def measure(fn, *args) -> tuple[float, float]:
+    """
+    (seconds, peak MiB allocated while fn runs).
+    """
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(*args)
+    seconds = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--length', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--lags', type=int, nargs='+', default=[3, 30, 100])
+    parser.add_argument('--series', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'length':>9} {'lags':>5} {'path':<20} {'seconds':>9} {'peak MiB':>9}")
+    for length in args.length:
+        panel = rng.poisson(100, size=(args.series, length)).astype(np.float64)
+        for lags in args.lags:
+            for name, fn in [('series_to_supervised', via_supervised),
+                             ('lag_matrix', via_lag_matrix)]:
+                seconds, peak = measure(fn, panel, lags)
+                print(f"{length:>9} {lags:>5} {name:<20} {seconds:>9.4f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
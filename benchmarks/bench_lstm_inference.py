@@ -0,0 +1,80 @@
+# benchmarks/bench_lstm_inference.py
+#
+# Latency per horizon step of multi-step LSTM inference: the old
+# one-`predict`-per-step-per-series loop vs. the batched compiled rollout
+# and the direct multi-output head.
+#
+#   python benchmarks/bench_lstm_inference.py [--series 1 20] [--horizon 12]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from src.forecasting import lstm_direct_forecast, lstm_recursive_forecast
+
+
+def build_model(n_lags: int, n_outputs: int):
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
+    model = Sequential([Input((n_lags, 1)), LSTM(50), Dense(n_outputs)])
+    model.compile(optimizer='adam', loss='mae')
+    return model
+
+
+def predict_loop(model, panel: np.ndarray, n_lags: int, horizon: int) -> np.ndarray:
+    """
+    The original inference path: one `predict` call per step per series.
+    """
+    out = np.empty((len(panel), horizon))
+    for s, history in enumerate(panel):
+        last_obs = history[:-n_lags - 1:-1].astype(float)
+        for h in range(horizon):
+            yhat = model.predict(last_obs.reshape(1, n_lags, 1), verbose=0)[0, 0]
+            out[s, h] = yhat
+            last_obs = np.roll(last_obs, 1)
+            last_obs[0] = yhat
+    return out
+
+
+def best_of(fn, repeats: int) -> float:
+    fn()    # warm-up (graph tracing)
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--series', type=int, nargs='+', default=[1, 20])
+    parser.add_argument('--horizon', type=int, default=12)
+    parser.add_argument('--lags', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    one_step = build_model(args.lags, 1)
+    direct   = build_model(args.lags, args.horizon)
+    rng      = np.random.default_rng(0)
+
+    print(f"{'series':>6} {'path':<18} {'total ms':>10} {'ms/step':>9}")
+    for n_series in args.series:
+        panel = rng.poisson(100, size=(n_series, 120)).astype(float)
+        paths = {
+            'predict loop':     lambda: predict_loop(one_step, panel, args.lags, args.horizon),
+            'batched rollout':  lambda: lstm_recursive_forecast(one_step, panel, args.lags, args.horizon),
+            'direct head':      lambda: lstm_direct_forecast(direct, panel, args.lags),
+        }
+        for name, fn in paths.items():
+            seconds = best_of(fn, args.repeats)
+            print(f"{n_series:>6} {name:<18} {seconds * 1e3:>10.1f} "
+                  f"{seconds * 1e3 / args.horizon:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
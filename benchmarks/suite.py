@@ -0,0 +1,323 @@
+# benchmarks/suite.py
+#
+# Timing and memory benchmarks of the pipeline hot paths on synthetic
+# CFPB-like data (benchmarks/synthetic.py), with regression tracking:
+#
+#   python benchmarks/suite.py --scale small --out results.json
+#   python benchmarks/suite.py --scale small --baseline benchmarks/baseline.json
+#   python benchmarks/suite.py --scale small --save-baseline benchmarks/baseline.json
+#
+# Each case reports the best of `repeat` wall-clock runs and the peak Python
+# heap allocation of one run (tracemalloc, a separate run so its overhead
+# does not inflate the timings). With --baseline, the exit status is 1 if
+# any case is more than --threshold slower (or --memory-threshold larger)
+# than the baseline of the same scale. Baselines are machine-specific:
+# regenerate them on the machine that runs the comparison.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from benchmarks.synthetic import write_synthetic_csv
+
+# name -> (rows, products)
+SCALES = {
+    'small':  (100_000, 5),
+    'medium': (1_000_000, 100),
+    'large':  (5_000_000, 1_000),
+}
+
+
+class Context:
+    """
+    Inputs shared by the cases, built lazily from the synthetic CSV.
+    """
+
+    def __init__(self, csv_path: str, workdir: str):
+        self.csv_path = csv_path
+        self.workdir  = workdir
+        self._cache   = {}
+
+    def _get(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def complaints(self) -> pd.DataFrame:
+        from src.data_ingestion import load_complaints
+        return self._get('complaints', lambda: load_complaints(
+            self.csv_path, usecols=['product'], chunksize=500_000, use_cache=False))
+
+    @property
+    def daily(self) -> pd.Series:
+        return self._get('daily', lambda: self.complaints.resample('D').size().astype(float))
+
+    @property
+    def monthly(self) -> pd.Series:
+        return self._get('monthly', lambda: self.complaints.resample('M').size())
+
+    @property
+    def train(self) -> pd.Series:
+        return self.monthly.iloc[:-3]
+
+
+def case_load_complaints(ctx):
+    from src.data_ingestion import load_complaints
+    return lambda: load_complaints(ctx.csv_path, use_cache=False)
+
+
+def case_load_complaints_chunked(ctx):
+    from src.data_ingestion import load_complaints
+    return lambda: load_complaints(ctx.csv_path, usecols=['product', 'state'],
+                                   chunksize=500_000, use_cache=False)
+
+
+def case_resample_monthly(ctx):
+    from src.data_ingestion import resample_counts
+    df = ctx.complaints
+    return lambda: resample_counts(df, freq='M', by='product')
+
+
+def case_count_complaints(ctx):
+    from src.data_ingestion import count_complaints
+    return lambda: count_complaints(ctx.csv_path, freq='M', by='product', use_cache=False)
+
+
+def case_series_to_supervised(ctx):
+    from src.feature_engineering import series_to_supervised
+    daily = ctx.daily
+    return lambda: series_to_supervised(daily, lags=30)
+
+
+def case_detect_spikes(ctx):
+    from src.anomaly_detection import detect_spikes
+    daily = ctx.daily
+    return lambda: detect_spikes(daily, window=30, z_thresh=3.0)
+
+
+def case_detect_change_points(ctx):
+    from src.anomaly_detection import detect_change_points
+    daily = ctx.daily
+    return lambda: detect_change_points(daily, model='rbf', pen=10)
+
+
+def case_panel_alerts(ctx):
+    from src.anomaly_detection import generate_panel_alerts
+    from src.data_ingestion import resample_counts
+    wide = resample_counts(ctx.complaints, freq='M', by='product')
+    return lambda: generate_panel_alerts(wide, model='l2', pen=1e6, cp_method='linear',
+                                         max_workers=1)
+
+
+def case_train_arima(ctx):
+    from src.model_training import train_arima
+    values = ctx.train.values
+    return lambda: train_arima(values)
+
+
+def case_train_prophet(ctx):
+    from src.model_training import train_prophet
+    df = pd.DataFrame({'ds': ctx.train.index, 'y': ctx.train.values})
+    return lambda: train_prophet(df)
+
+
+def case_train_lstm(ctx):
+    from src.feature_engineering import series_to_supervised
+    from src.model_training import train_lstm
+    supervised = series_to_supervised(ctx.train, lags=3).values
+    return lambda: train_lstm(supervised, n_lags=3)
+
+
+def case_main(ctx):
+    from src.forecasting import main
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(ctx.workdir)          # main() writes reports/ under the cwd
+        try:
+            return main(ctx.csv_path)
+        finally:
+            os.chdir(cwd)
+    return run
+
+
+# name -> (setup(ctx) -> callable, repeat, group)
+CASES = {
+    'load_complaints':         (case_load_complaints,         3, 'io'),
+    'load_complaints_chunked': (case_load_complaints_chunked, 3, 'io'),
+    'count_complaints':        (case_count_complaints,        3, 'io'),
+    'resample_monthly':        (case_resample_monthly,        5, 'core'),
+    'series_to_supervised':    (case_series_to_supervised,    5, 'core'),
+    'detect_spikes':           (case_detect_spikes,           5, 'core'),
+    'detect_change_points':    (case_detect_change_points,    3, 'core'),
+    'generate_panel_alerts':   (case_panel_alerts,            3, 'core'),
+    'train_arima':             (case_train_arima,             1, 'models'),
+    'train_prophet':           (case_train_prophet,           1, 'models'),
+    'train_lstm':              (case_train_lstm,              1, 'models'),
+    'main':                    (case_main,                    1, 'end_to_end'),
+}
+
+
+def measure(fn, repeat: int, memory: bool = True) -> dict:
+    """
+    Best-of-`repeat` wall and CPU seconds, plus the tracemalloc peak (MB)
+    of one extra run. Output printed by `fn` is discarded.
+    """
+    walls, cpus = [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            w0, c0 = time.perf_counter(), time.process_time()
+            fn()
+            walls.append(time.perf_counter() - w0)
+            cpus.append(time.process_time() - c0)
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                fn()
+                peak = tracemalloc.get_traced_memory()[1] / 2**20
+            finally:
+                tracemalloc.stop()
+    return {'seconds': min(walls), 'cpu_seconds': min(cpus), 'runs': walls, 'peak_mb': peak}
+
+
+def run_suite(
+    rows: int,
+    products: int,
+    cases: list[str],
+    data_dir: str,
+    memory: bool = True,
+    seed: int = 0,
+    repeat: int | None = None
+) -> dict:
+    csv_path = write_synthetic_csv(
+        os.path.join(data_dir, f'complaints-{rows}-{products}-{seed}.csv'), rows, products, seed
+    )
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        ctx = Context(csv_path, workdir)
+        for name in cases:
+            setup, n_runs, _ = CASES[name]
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                results[name] = measure(setup(ctx), repeat or n_runs, memory)
+            r = results[name]
+            peak = f"{r['peak_mb']:>9.1f}" if r['peak_mb'] is not None else f"{'-':>9}"
+            print(f"{name:<24} {r['seconds']:>9.3f} {r['cpu_seconds']:>9.3f} {peak}", flush=True)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    threshold: float = 0.25,
+    memory_threshold: float = 0.25,
+    min_seconds: float = 0.05
+) -> list[str]:
+    """
+    Regressions of `results` against `baseline` (both as written by this
+    script, same scale). A case regresses when it is both `threshold`
+    (relative) and `min_seconds` (absolute) slower, or its peak memory is
+    `memory_threshold` larger. Returns one message per regression.
+    """
+    regressions = []
+    for name, r in results['results'].items():
+        b = baseline['results'].get(name)
+        if b is None:
+            continue
+        slower = r['seconds'] - b['seconds']
+        if r['seconds'] > b['seconds'] * (1 + threshold) and slower > min_seconds:
+            regressions.append(f"{name}: {r['seconds']:.3f}s vs baseline {b['seconds']:.3f}s "
+                               f"(+{slower / b['seconds']:.0%})")
+        if r.get('peak_mb') and b.get('peak_mb') and r['peak_mb'] > b['peak_mb'] * (1 + memory_threshold):
+            regressions.append(f"{name}: peak {r['peak_mb']:.1f} MB vs baseline {b['peak_mb']:.1f} MB")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--rows', type=int, help='override the rows of --scale')
+    parser.add_argument('--products', type=int, help='override the products of --scale')
+    parser.add_argument('--cases', nargs='+', choices=CASES, help='default: all')
+    parser.add_argument('--groups', nargs='+', choices=sorted({g for *_, g in CASES.values()}))
+    parser.add_argument('--repeat', type=int, help='timed runs per case (default: per case)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc runs')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'complaints-bench'))
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', help='write results JSON here as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed relative slowdown (default: 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    rows, products = SCALES[args.scale]
+    rows     = args.rows or rows
+    products = args.products or products
+    cases    = args.cases or [n for n, (*_, g) in CASES.items()
+                              if args.groups is None or g in args.groups]
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    print(f"scale={args.scale} rows={rows:,} products={products}")
+    print(f"{'case':<24} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}")
+    results = {
+        'meta': {
+            'scale': args.scale, 'rows': rows, 'products': products,
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'commit': _git_commit(), 'timestamp': time.time(),
+        },
+        'results': run_suite(rows, products, cases, args.data_dir, not args.no_memory,
+                             repeat=args.repeat),
+    }
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline['meta']['rows'], baseline['meta']['products']) != (rows, products):
+            print(f"Baseline was recorded at rows={baseline['meta']['rows']:,} "
+                  f"products={baseline['meta']['products']}; not comparable")
+            return 2
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print("\nRegressions:")
+            for msg in regressions:
+                print(f"  {msg}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
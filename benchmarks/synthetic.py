@@ -0,0 +1,109 @@
+# benchmarks/synthetic.py
+#
+# Synthetic CFPB-like complaints for benchmarks: the same columns as the
+# cleaned CSV (date_received, product, issue, state, company, complaint_id),
+# Zipf-distributed product/company popularity, yearly seasonality, trend,
+# weekday effects and a few short bursts. Rows are generated and
+# written chunk by chunk, so 5M-row files need little memory.
+#
+#   python benchmarks/synthetic.py out.csv --rows 1000000 --products 100
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+STATES = [
+    'AK', 'AL', 'AR', 'AZ', 'CA', 'CO', 'CT', 'DC', 'DE', 'FL', 'GA', 'HI', 'IA',
+    'ID', 'IL', 'IN', 'KS', 'KY', 'LA', 'MA', 'MD', 'ME', 'MI', 'MN', 'MO', 'MS',
+    'MT', 'NC', 'ND', 'NE', 'NH', 'NJ', 'NM', 'NV', 'NY', 'OH', 'OK', 'OR', 'PA',
+    'PR', 'RI', 'SC', 'SD', 'TN', 'TX', 'UT', 'VA', 'VT', 'WA', 'WI', 'WV', 'WY',
+]
+ISSUES = [
+    'Incorrect information on your report', 'Problem with a credit reporting company',
+    'Attempts to collect debt not owed', 'Managing an account', 'Trouble during payment process',
+    'Struggling to pay mortgage', 'Fraud or scam', 'Closing an account',
+    'Problem with a purchase shown on your statement', 'Dealing with your lender or servicer',
+]
+
+
+def _zipf_weights(n: int, a: float = 1.1) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** a
+    return w / w.sum()
+
+
+def _day_weights(days: pd.DatetimeIndex, rng) -> np.ndarray:
+    """
+    Relative complaint volume per day: upward trend, yearly cycle, quieter
+    weekends and a handful of short bursts.
+    """
+    t      = np.arange(len(days)) / 365.25
+    weight = (1 + 0.15 * t) * (1 + 0.1 * np.sin(2 * np.pi * days.dayofyear.to_numpy() / 365.25))
+    weight = weight * np.where(days.dayofweek >= 5, 0.4, 1.0)
+    for start in rng.integers(0, len(days) - 30, size=max(1, len(days) // 700)):
+        weight[start:start + rng.integers(5, 30)] *= rng.uniform(1.5, 3.0)
+    return weight / weight.sum()
+
+
+def iter_synthetic_chunks(
+    n_rows: int,
+    n_products: int = 5,
+    start: str = '2015-01-01',
+    end: str = '2022-12-31',
+    seed: int = 0,
+    chunksize: int = 1_000_000
+):
+    """
+    Yield DataFrames of synthetic complaints totalling `n_rows` rows.
+    """
+    rng      = np.random.default_rng(seed)
+    days     = pd.date_range(start, end, freq='D')
+    day_w    = _day_weights(days, rng)
+    products = np.array([f'Product {i:04d}' for i in range(n_products)], dtype=object)
+    prod_w   = _zipf_weights(n_products)
+    companies = np.array([f'Company {i:04d}' for i in range(max(20, n_products * 5))], dtype=object)
+    comp_w   = _zipf_weights(len(companies), 1.3)
+    state_w  = _zipf_weights(len(STATES), 0.8)
+
+    done = 0
+    while done < n_rows:
+        n    = min(chunksize, n_rows - done)
+        date = days.values[rng.choice(len(days), size=n, p=day_w)]
+        yield pd.DataFrame({
+            'date_received': date,
+            'product':       products[rng.choice(n_products, size=n, p=prod_w)],
+            'issue':         np.array(ISSUES, dtype=object)[rng.integers(0, len(ISSUES), n)],
+            'state':         np.array(STATES, dtype=object)[rng.choice(len(STATES), size=n, p=state_w)],
+            'company':       companies[rng.choice(len(companies), size=n, p=comp_w)],
+            'complaint_id':  np.arange(done, done + n),
+        })
+        done += n
+
+
+def write_synthetic_csv(path: str, n_rows: int, n_products: int = 5, seed: int = 0, **kwargs) -> str:
+    """
+    Write synthetic complaints to `path` (skipped if it already exists).
+    """
+    if os.path.exists(path):
+        return path
+    tmp = path + '.tmp'
+    for i, chunk in enumerate(iter_synthetic_chunks(n_rows, n_products, seed=seed, **kwargs)):
+        chunk.to_csv(tmp, mode='w' if i == 0 else 'a', header=i == 0, index=False,
+                     date_format='%Y-%m-%d')
+    os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--products', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(write_synthetic_csv(args.path, args.rows, args.products, args.seed))
+
+
+if __name__ == "__main__":
+    main()
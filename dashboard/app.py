@@ -0,0 +1,123 @@
+# dashboard/app.py
+#
+# Streamlit dashboard over the pre-aggregated cube (src/cube.py):
+#
+#   python -m src.cube data/processed/cleaned_consumer_complaints.csv data/cube
+#   python -m src.forecasting <csv> "" "" data/cube     # forecasts + alerts
+#   CUBE_DIR=data/cube streamlit run dashboard/app.py
+#
+# Widgets only filter and slice small cached frames; the raw complaints
+# are never read here. Loaders are memoized on (cube_dir, version), so a
+# rebuilt cube is picked up on the next rerun and one product's state
+# counts are loaded only when that product is first selected.
+
+import os
+import sys
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from src import cube  # noqa: E402
+
+CUBE_DIR = os.environ.get('CUBE_DIR', os.path.join('data', 'cube'))
+
+
+@st.cache_data(show_spinner=False)
+def totals(cube_dir: str, version: str) -> pd.DataFrame:
+    df = cube.load_totals(cube_dir)
+    return df.assign(**{cube.TOTAL_SERIES: df.sum(axis=1)})
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def product_counts(cube_dir: str, version: str, product: str) -> pd.DataFrame:
+    return cube.load_product_counts(cube_dir, product)
+
+
+@st.cache_data(show_spinner=False)
+def forecasts(cube_dir: str, version: str) -> pd.DataFrame:
+    return cube.load_forecasts(cube_dir)
+
+
+@st.cache_data(show_spinner=False)
+def alerts(cube_dir: str, version: str) -> pd.DataFrame:
+    return cube.load_alerts(cube_dir)
+
+
+def series_for(cube_dir: str, version: str, product: str, states: list[str]) -> pd.Series:
+    """
+    Counts of `product` (or the total), summed over `states` if any are picked.
+    """
+    if not states:
+        return totals(cube_dir, version)[product]
+    return product_counts(cube_dir, version, product)[states].sum(axis=1)
+
+
+st.set_page_config(page_title='Consumer complaints', layout='wide')
+st.title('US consumer complaints: forecasts & anomalies')
+
+if not os.path.exists(os.path.join(CUBE_DIR, cube.MANIFEST_FILE)):
+    st.error(f'No cube found in {CUBE_DIR!r}; build it with `python -m src.cube <csv> {CUBE_DIR}`.')
+    st.stop()
+
+version  = cube.cube_version(CUBE_DIR)
+products = list(totals(CUBE_DIR, version).columns)
+
+with st.sidebar:
+    product = st.selectbox('Product', products, index=len(products) - 1)
+    states  = []
+    if product != cube.TOTAL_SERIES:
+        states = st.multiselect('States', list(product_counts(CUBE_DIR, version, product).columns))
+    fc      = forecasts(CUBE_DIR, version)
+    fc      = fc[fc['series'] == product]
+    models  = st.multiselect('Models', sorted(fc['model'].unique()), default=sorted(fc['model'].unique()))
+    max_h   = int(fc.groupby('model').size().max()) if len(fc) else 1
+    horizon = st.slider('Horizon (periods)', 1, max(max_h, 2), value=max_h)
+    n_obs   = len(totals(CUBE_DIR, version))
+    history = st.slider('History (periods)', min(12, n_obs), n_obs, value=min(60, n_obs))
+    show_alerts = st.checkbox('Show anomalies', value=True)
+
+actual = series_for(CUBE_DIR, version, product, states).iloc[-history:]
+actual = actual.rename('value').rename_axis('date').reset_index()
+
+layers = [
+    alt.Chart(actual).mark_line(color='#4c78a8').encode(
+        x=alt.X('date:T', title=None), y=alt.Y('value:Q', title='Complaints'),
+        tooltip=['date:T', 'value:Q'],
+    )
+]
+
+fc = fc[fc['model'].isin(models)]
+fc = fc[fc.groupby('model').cumcount() < horizon]
+if len(fc) and not states:
+    layers.append(
+        alt.Chart(fc).mark_line(point=True, strokeDash=[4, 3]).encode(
+            x='date:T', y='forecast:Q', color=alt.Color('model:N', title='Model'),
+            tooltip=['model:N', 'date:T', 'actual:Q', 'forecast:Q'],
+        )
+    )
+
+if show_alerts and not states:
+    al = alerts(CUBE_DIR, version)
+    al = al[(al['series'] == product) & (al['date'] >= actual['date'].min())]
+    al = al.merge(actual, on='date', how='left')
+    if len(al):
+        layers.append(
+            alt.Chart(al).mark_point(size=90, filled=True).encode(
+                x='date:T', y='value:Q',
+                color=alt.Color('alert_type:N', scale=alt.Scale(range=['#e45756', '#f58518']),
+                                title='Alert'),
+                tooltip=['date:T', 'alert_type:N', 'value:Q'],
+            )
+        )
+
+st.altair_chart(alt.layer(*layers).resolve_scale(color='independent'), use_container_width=True)
+
+if len(fc):
+    st.subheader('Forecast vs. actual')
+    st.dataframe(fc.pivot_table(index='date', columns='model', values='forecast')
+                 .join(fc.groupby('date')['actual'].first()), use_container_width=True)
+if states:
+    st.caption('Forecasts and alerts are stored for whole products; they are hidden when filtering by state.')
@@ -1,10 +1,16 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 from statsmodels.tsa.seasonal import seasonal_decompose
-df = pd.read_csv(
-    "C:\\Users\\ssbap\\US-Consumer-Complaints-Forecasting\\data\\raw\\cleaned_consumer_complaints.csv"
-    # parse_dates=['date_received'],
-    # index_col='date_received'
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+from src.data_ingestion import load_complaints
+
+# Only the date column is needed for counts; reads the Parquet cache
+# (python -m src.parquet_cache <csv>) instead of the CSV when it is fresh.
+df = load_complaints(
+    "C:\\Users\\ssbap\\US-Consumer-Complaints-Forecasting\\data\\raw\\cleaned_consumer_complaints.csv",
+    usecols=[]
 )
 
 # Quick peek at the data
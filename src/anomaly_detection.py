@@ -1,11 +1,14 @@
 # src/anomaly_detection.py
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-import ruptures as rpt
-from scipy.stats import zscore
 from typing import List, Union
 
+from src import instrumentation
+
 def detect_spikes(
     series: pd.Series,
     window: int = 12,
@@ -29,29 +32,147 @@ def detect_spikes(
     spikes   = z_scores.abs() > z_thresh
     return series.index[spikes]
 
+def _cumsum_cost(values: np.ndarray, model: str):
+    """
+    Segment cost C(start, end) in O(1) from cumulative sums, vectorised
+    over arrays of start/end indices. Matches ruptures' "l2" (sum of
+    squared deviations) and "normal" (n * log(variance + 1e-6)) costs.
+    """
+    if model not in ("l2", "normal"):
+        raise ValueError(f"Linear-cost change-point search supports 'l2' and 'normal', not {model!r}")
+    x  = values - values.mean()      # centring keeps the cumulative sums well conditioned
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    def cost(start, end):
+        n   = end - start
+        m   = (s1[end] - s1[start]) / n
+        var = np.maximum((s2[end] - s2[start]) / n - m * m, 0.0)
+        return n * var if model == "l2" else n * np.log(var + 1e-6)
+    return cost
+
+
+def _pelt_linear(
+    values: np.ndarray,
+    model: str,
+    pen: float,
+    min_size: int,
+    jump: int
+) -> List[int]:
+    """
+    Exact PELT search (same optimum as ruptures' Pelt for l2/normal) with
+    cumulative-sum costs: O(1) per candidate instead of O(segment length).
+    """
+    n    = len(values)
+    cost = _cumsum_cost(values, model)
+    grid = np.array([0] + list(range(jump, n, jump)) + [n])
+    F    = np.full(len(grid), np.inf)
+    prev = np.zeros(len(grid), dtype=int)
+    F[0] = -pen
+    R    = np.array([0])
+    for j in range(1, len(grid)):
+        t     = grid[j]
+        valid = t - grid[R] >= min_size
+        cand  = R[valid]
+        if len(cand):
+            c       = F[cand] + cost(grid[cand], t)
+            best    = np.argmin(c)
+            F[j]    = c[best] + pen
+            prev[j] = cand[best]
+            # PELT pruning: s can never be the last break after t again
+            R = np.concatenate([R[~valid], cand[c <= F[j]]])
+        R = np.append(R, j)
+
+    bkps, j = [], len(grid) - 1
+    while j > 0:
+        j = prev[j]
+        if j > 0:
+            bkps.append(int(grid[j]))
+    return bkps[::-1]
+
+
+def _binseg_linear(
+    values: np.ndarray,
+    model: str,
+    pen: float,
+    min_size: int,
+    jump: int
+) -> List[int]:
+    """
+    Binary segmentation with cumulative-sum costs: split a segment at the
+    point of largest cost reduction while that reduction exceeds `pen`.
+    Approximate, but O(n log n) overall.
+    """
+    cost  = _cumsum_cost(values, model)
+    bkps  = []
+    stack = [(0, len(values))]
+    while stack:
+        a, b = stack.pop()
+        ks = np.arange(a + min_size, b - min_size + 1)
+        ks = ks[ks % jump == 0]
+        if not len(ks):
+            continue
+        gain = cost(a, b) - cost(a, ks) - cost(ks, b)
+        best = np.argmax(gain)
+        if gain[best] > pen:
+            k = int(ks[best])
+            bkps.append(k)
+            stack += [(a, k), (k, b)]
+    return sorted(bkps)
+
+
 def detect_change_points(
     series: pd.Series,
     model: str = "rbf",
-    pen: Union[float, int] = 10
+    pen: Union[float, int] = 10,
+    method: str = "pelt",
+    min_size: int = 2,
+    jump: int = 5,
+    since: Union[pd.Timestamp, str, None] = None
 ) -> List[pd.Timestamp]:
     """
-    Detect change-points in the series using the PELT algorithm.
+    Detect change-points in the series.
     
     Args:
         series: time-indexed series of counts.
-        model: cost function model for ruptures (e.g. "l1", "l2", "rbf").
+        model: cost function model (e.g. "l1", "l2", "rbf", "normal").
         pen: penalty value controlling sensitivity (higher → fewer breaks).
+        method: "pelt"   - ruptures PELT, any model. The "rbf" cost builds an
+                           n x n kernel matrix, so keep it to short series.
+                "linear" - exact PELT for "l2"/"normal" with O(1) segment
+                           costs from cumulative sums; use for long daily series.
+                "binseg" - binary segmentation for "l2"/"normal" with the same
+                           costs; approximate, O(n log n).
+        min_size, jump: minimum segment length and breakpoint grid spacing
+            (ruptures' defaults).
+        since: incremental mode - only search the tail of the series from
+            this timestamp on (e.g. the last confirmed change-point).
     
     Returns:
         List of pd.Timestamp where a change-point is detected.
     """
-    # prepare data for ruptures (needs 2D array)
-    arr = series.values.reshape(-1, 1)
-    algo = rpt.Pelt(model=model).fit(arr)
-    # breakpoints includes the end of the series; drop it
-    bkps = algo.predict(pen=pen)
+    offset = 0
+    if since is not None:
+        offset = int(series.index.searchsorted(pd.Timestamp(since)))
+    values = series.values[offset:].astype(float)
+    if len(values) < 2 * min_size:
+        return []
+
+    if method == "pelt":
+        import ruptures as rpt   # imported lazily: slow, only needed here
+        # prepare data for ruptures (needs 2D array)
+        arr  = values.reshape(-1, 1)
+        algo = rpt.Pelt(model=model, min_size=min_size, jump=jump).fit(arr)
+        # breakpoints includes the end of the series; drop it
+        bkps = algo.predict(pen=pen)
+    elif method == "linear":
+        bkps = _pelt_linear(values, model, pen, min_size, jump)
+    elif method == "binseg":
+        bkps = _binseg_linear(values, model, pen, min_size, jump)
+    else:
+        raise ValueError(f"Unknown method {method!r}; use 'pelt', 'linear' or 'binseg'")
     # map break indices to timestamps, ignore last index (== len)
-    change_idxs = [i for i in bkps if i < len(series)]
+    change_idxs = [offset + i for i in bkps if i < len(values)]
     return [series.index[i] for i in change_idxs]
 
 def generate_alerts_report(
@@ -59,7 +180,9 @@ def generate_alerts_report(
     window: int = 12,
     z_thresh: float = 3.0,
     model: str = "rbf",
-    pen: Union[float, int] = 10
+    pen: Union[float, int] = 10,
+    cp_method: str = "pelt",
+    since: Union[pd.Timestamp, str, None] = None
 ) -> pd.DataFrame:
     """
     Build a report of spike and change-point dates.
@@ -68,12 +191,18 @@ def generate_alerts_report(
         series: time-indexed series of counts.
         window, z_thresh: passed to detect_spikes.
         model, pen: passed to detect_change_points.
+        cp_method, since: change-point search method and incremental start,
+            passed to detect_change_points as `method` / `since`.
     
     Returns:
         DataFrame with columns ['date','alert_type'].
     """
-    spikes = detect_spikes(series, window=window, z_thresh=z_thresh)
-    cps    = detect_change_points(series, model=model, pen=pen)
+    with instrumentation.stage('alerts.spikes', series=series.name, rows=len(series)):
+        spikes = detect_spikes(series, window=window, z_thresh=z_thresh)
+    with instrumentation.stage('alerts.change_points', series=series.name, rows=len(series),
+                               model=model, method=cp_method):
+        cps = detect_change_points(series, model=model, pen=pen,
+                                   method=cp_method, since=since)
     
     records = []
     for dt in spikes:
@@ -81,7 +210,7 @@ def generate_alerts_report(
     for dt in cps:
         records.append({"date": dt, "alert_type": "change_point"})
     
-    report = pd.DataFrame(records)
+    report = pd.DataFrame(records, columns=["date", "alert_type"])
     # ensure chronological order and drop duplicates if overlap
     report = (
         report
@@ -90,3 +219,127 @@ def generate_alerts_report(
         .reset_index(drop=True)
     )
     return report
+
+
+def _to_wide(panel: pd.DataFrame, keys, date_col: str, value_col: str,
+             freq: Union[str, None] = None) -> pd.DataFrame:
+    """
+    Gap-free date x series frame from either a wide frame or a long frame
+    with key column(s), a date column and a value column. Key/date
+    combinations without rows count as 0, and the dates are reindexed to
+    the full `freq` range (inferred when not given), so detection sees the
+    same time axis as the per-series path.
+    """
+    if date_col in panel.columns:
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        wide = panel.pivot_table(index=date_col, columns=keys, values=value_col,
+                                 aggfunc="sum", fill_value=0, observed=True)
+    else:
+        wide = panel.fillna(0)
+    wide = wide.sort_index()
+    if freq is None and len(wide) < 3:          # too short to infer, nothing to fill
+        return wide
+    freq = freq or wide.index.freqstr or pd.infer_freq(wide.index)
+    if freq is None:
+        raise ValueError("Cannot infer the period of the panel dates; pass freq=")
+    full = pd.date_range(wide.index[0], wide.index[-1], freq=freq)
+    return wide.reindex(full, fill_value=0)
+
+
+def _panel_change_points(
+    batch: List[tuple],
+    model: str,
+    pen: Union[float, int],
+    method: str
+) -> List[tuple]:
+    """
+    Change-points for a batch of (key, series) pairs; runs in a worker.
+    """
+    out = []
+    for key, series in batch:
+        with instrumentation.stage('alerts.change_points', series=key, rows=len(series),
+                                   model=model, method=method):
+            cps = detect_change_points(series, model=model, pen=pen, method=method)
+        out.extend((key, dt) for dt in cps)
+    return out
+
+
+def generate_panel_alerts(
+    panel: pd.DataFrame,
+    window: int = 12,
+    z_thresh: float = 3.0,
+    model: str = "rbf",
+    pen: Union[float, int] = 10,
+    cp_method: str = "pelt",
+    keys: Union[str, List[str]] = "series",
+    date_col: str = "date",
+    value_col: str = "value",
+    freq: Union[str, None] = None,
+    max_workers: Union[int, None] = None,
+    batch_size: int = 256
+) -> pd.DataFrame:
+    """
+    `generate_alerts_report` for many series in one pass.
+
+    Args:
+        panel: wide frame (DatetimeIndex x one column per series) or long
+            frame with `keys` column(s), `date_col` and `value_col` (e.g.
+            product x state x company counts). Missing combinations count
+            as 0.
+        freq: period of the dates, used to fill dates missing from every
+            series (inferred when not given).
+        window, z_thresh: spike detection, as in detect_spikes; computed for
+            all series at once with one rolling op over the wide frame.
+        model, pen, cp_method: change-point detection, as in
+            generate_alerts_report; series are spread over a process pool in
+            batches of `batch_size`.
+        max_workers: pool size (default: number of CPUs); 1 runs in-process.
+
+    Returns:
+        DataFrame with columns ['series','date','alert_type'], where
+        'series' is the column key (a tuple for several key columns).
+    """
+    wide = _to_wide(panel, keys, date_col, value_col, freq)
+    wide = wide.astype(float)
+
+    # spikes: vectorised rolling z-scores over every column at once
+    with instrumentation.stage('alerts.panel_spikes', rows=wide.size, n_series=wide.shape[1]):
+        rolling = wide.rolling(window, center=True, min_periods=1)
+        z_scores = (wide - rolling.mean()) / rolling.std(ddof=0)
+        rows, cols = np.nonzero((z_scores.abs() > z_thresh).to_numpy())
+    spikes = pd.DataFrame({
+        "series": wide.columns[cols].to_numpy(),
+        "date": wide.index[rows],
+        "alert_type": "spike",
+    })
+
+    # change-points: one search per series, batched across worker processes
+    items   = list(wide.items())
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    with instrumentation.stage('alerts.panel_change_points', rows=wide.size,
+                               n_series=wide.shape[1], model=model, method=cp_method):
+        if max_workers == 1 or len(batches) <= 1:
+            results = [_panel_change_points(b, model, pen, cp_method) for b in batches]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=instrumentation.init_worker,
+                initargs=(instrumentation.config(),),
+            ) as pool:
+                futures = [
+                    instrumentation.submit(pool, _panel_change_points, b, model, pen, cp_method)
+                    for b in batches
+                ]
+                results = [instrumentation.result(f) for f in futures]
+    cps = pd.DataFrame(
+        [pair for result in results for pair in result], columns=["series", "date"]
+    ).assign(alert_type="change_point")
+
+    report = (
+        pd.concat([f for f in (spikes, cps) if len(f)] or [spikes], ignore_index=True)
+        .drop_duplicates(["series", "date", "alert_type"])
+        .sort_values(["series", "date"], kind="stable")
+        .reset_index(drop=True)
+    )
+    return report
@@ -0,0 +1,145 @@
+# src/arima_orders.py
+#
+# Per-series cache of selected ARIMA orders. The expensive auto-ARIMA order
+# search runs once per series; later fits on the same (longer) series reuse
+# the (p,d,q)(P,D,Q,m) order and only re-estimate coefficients, warm-started
+# from the previous fit. A full search runs again every `research_every`
+# refits, or as soon as the refitted residuals fail a Ljung-Box test.
+# One JSON file per series, replaced atomically, so pool workers can share
+# a cache directory.
+
+import hashlib
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+
+from src import instrumentation
+
+
+def ljung_box_pvalue(residuals, lags: int | None = None) -> float:
+    """
+    Ljung-Box p-value of the residuals (low: autocorrelation left over,
+    i.e. the order no longer fits the series).
+    """
+    from statsmodels.stats.diagnostic import acorr_ljungbox
+    residuals = np.asarray(residuals, dtype=float)
+    lags      = lags or max(1, min(10, len(residuals) // 5))
+    return float(acorr_ljungbox(residuals, lags=[lags], return_df=True)['lb_pvalue'].iloc[0])
+
+
+class ArimaOrderCache:
+    """
+    Directory of cached ARIMA orders, one entry per series key.
+
+    Args:
+        root: cache directory.
+        research_every: run a full order search after this many order-cached
+            refits of a series.
+        min_pvalue: re-search when the Ljung-Box p-value of a refit's
+            residuals falls below this.
+        n_jobs: processes for the full search (see `search_arima`); keep it
+            at 1 (or the per-worker budget) when the cache is used in a pool.
+        readonly: reuse cached orders without writing back or re-searching
+            on schedule (e.g. backtest folds, so a fold never sees an order
+            found on a later cutoff). Series without an entry, or whose
+            refit degrades, get an unrecorded search on their own data.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        research_every: int = 12,
+        min_pvalue: float = 0.01,
+        n_jobs: int = -1,
+        readonly: bool = False
+    ):
+        self.root           = os.fspath(root)
+        self.research_every = research_every
+        self.min_pvalue     = min_pvalue
+        self.n_jobs         = n_jobs
+        self.readonly       = readonly
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key) -> str:
+        name = hashlib.sha1(json.dumps(key, default=str).encode()).hexdigest()
+        return os.path.join(self.root, name + '.json')
+
+    def get(self, key) -> dict | None:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def put(self, key, entry: dict) -> None:
+        path = self._path(key)
+        tmp  = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'key': key, **entry}, f, indent=2, default=str)
+        os.replace(tmp, path)
+
+    def _record(self, key, model, n_obs: int, refits: int, searched_at: float) -> None:
+        params = model.get_params()
+        self.put(key, {
+            'order':          list(params['order']),
+            'seasonal_order': list(params['seasonal_order']),
+            'with_intercept': params['with_intercept'],
+            'params':         np.asarray(model.params()).tolist(),
+            'n_obs':          n_obs,
+            'refits':         refits,
+            'searched_at':    searched_at,
+        })
+
+    def fit(self, key, train_array):
+        """
+        Fit an ARIMA for series `key`: refit the cached order if there is
+        one and it is still due no re-search, else run the full search.
+        Returns the fitted pmdarima model.
+        """
+        from src.model_training import refit_arima, search_arima
+
+        if key is None:
+            raise ValueError("ArimaOrderCache needs a series key; name the series")
+        entry = self.get(key)
+        if entry is not None and (self.readonly or entry['refits'] < self.research_every):
+            try:
+                with instrumentation.stage('arima.refit', series=key, rows=len(train_array)):
+                    model = refit_arima(train_array, entry['order'], entry['seasonal_order'],
+                                        entry['with_intercept'], start_params=entry['params'])
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    pvalue = ljung_box_pvalue(model.resid())
+                if pvalue >= self.min_pvalue:
+                    if self.readonly:
+                        return model
+                    self._record(key, model, len(train_array), entry['refits'] + 1,
+                                 entry['searched_at'])
+                    return model
+                print(f"ARIMA order for {key!r} degraded (Ljung-Box p={pvalue:.3g}); re-searching")
+            except Exception as e:
+                print(f"Refit of cached ARIMA order for {key!r} failed: {e}; re-searching")
+
+        with instrumentation.stage('arima.search', series=key, rows=len(train_array)):
+            model = search_arima(train_array, n_jobs=self.n_jobs)
+        if not self.readonly:
+            self._record(key, model, len(train_array), 0, time.time())
+        return model
+
+    def seed(self, key, train_array):
+        """
+        Make sure the cached order of `key` was selected on at most
+        `train_array` (searching on it otherwise), e.g. on the first
+        backtest cutoff before the folds fan out.
+        """
+        if key is None:
+            raise ValueError("ArimaOrderCache needs a series key; name the series")
+        entry = self.get(key)
+        if entry is not None and entry['n_obs'] <= len(train_array):
+            return
+        with instrumentation.stage('arima.search', series=key, rows=len(train_array)):
+            from src.model_training import search_arima
+            model = search_arima(train_array, n_jobs=self.n_jobs)
+        self._record(key, model, len(train_array), 0, time.time())
@@ -0,0 +1,232 @@
+# src/backtesting.py
+#
+# Walk-forward (rolling-origin, expanding-window) backtesting of the
+# forecasting models, with folds evaluated in parallel.
+#
+# strategy='refit'   every (origin, model) pair is fitted from scratch; all
+#                    pairs run concurrently on the pool.
+# strategy='update'  each model is fitted once at the first origin of a chain
+#                    and then cheaply updated as the origin moves forward:
+#                    pmdarima's ARIMA.update(), Prophet warm-started from the
+#                    previous optimum, LSTM fine-tuned from its old weights.
+#                    Chains (one per model, or `n_chains` blocks of origins
+#                    per model) run concurrently.
+
+import numpy as np
+import pandas as pd
+
+from src                     import instrumentation
+from src.arima_orders        import ArimaOrderCache
+from src.batch_forecasting   import forecast_pool, resolve_models
+from src.feature_engineering import lag_matrix
+from src.forecasting         import lstm_recursive_forecast
+from src.model_registry      import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, ModelRegistry
+from src.utils               import evaluate_forecasts
+
+PREDICTION_COLUMNS = ['origin', 'step', 'date', 'model', 'actual', 'forecast', 'error']
+
+
+def rolling_origins(
+    n_obs: int,
+    n_origins: int,
+    horizon: int,
+    step: int = 1
+) -> list[int]:
+    """
+    Training-set lengths (cut points) for `n_origins` rolling origins, the
+    last one leaving exactly `horizon` observations to forecast.
+    """
+    last  = n_obs - horizon
+    cuts  = [last - i * step for i in range(n_origins)][::-1]
+    if cuts[0] < 1:
+        raise ValueError(
+            f"{n_obs} observations are too few for {n_origins} origins "
+            f"with horizon={horizon} and step={step}"
+        )
+    return cuts
+
+
+def _refit_fold(series: pd.Series, cut: int, horizon: int, forecaster) -> np.ndarray:
+    return np.asarray(forecaster(series.iloc[:cut], horizon), dtype=float)
+
+
+def _arima_chain(series: pd.Series, cuts: list[int], horizon: int) -> list[np.ndarray]:
+    from src.model_training import train_arima
+    model = train_arima(series.values[:cuts[0]])
+    preds = [np.asarray(model.predict(n_periods=horizon))]
+    for prev, cut in zip(cuts, cuts[1:]):
+        model.update(series.values[prev:cut])
+        preds.append(np.asarray(model.predict(n_periods=horizon)))
+    return preds
+
+
+def _prophet_chain(series: pd.Series, cuts: list[int], horizon: int) -> list[np.ndarray]:
+    from src.model_training import prophet_warm_start, train_prophet
+    freq  = series.index.freqstr or 'M'
+    init  = None
+    preds = []
+    for cut in cuts:
+        train = series.iloc[:cut]
+        try:
+            m        = train_prophet(pd.DataFrame({'ds': train.index, 'y': train.values}), init=init)
+            future   = m.make_future_dataframe(periods=horizon, freq=freq)
+            preds.append(m.predict(future)['yhat'].iloc[-horizon:].values)
+            init     = prophet_warm_start(m)
+        except Exception as e:
+            print(f"Prophet failed: {e}")
+            preds.append(np.full(horizon, np.nan))
+    return preds
+
+
+def _lstm_chain(
+    series: pd.Series,
+    cuts: list[int],
+    horizon: int,
+    n_lags: int = 3,
+    update_epochs: int = 5
+) -> list[np.ndarray]:
+    from src.model_training import fit_lstm
+    model = None
+    preds = []
+    for cut in cuts:
+        train  = series.iloc[:cut]
+        X, y   = lag_matrix(train.values, n_lags)
+        epochs = 50 if model is None else update_epochs
+        model  = fit_lstm(X, y, epochs=epochs, model=model)
+        preds.append(lstm_recursive_forecast(model, train.values, n_lags, horizon))
+    return preds
+
+
+def _run_chain(name: str, chain, series: pd.Series, cuts: list[int], horizon: int) -> list[np.ndarray]:
+    with instrumentation.stage(f'backtest.{name}', series=series.name, rows=len(cuts)):
+        return chain(series, cuts, horizon)
+
+
+# Model name -> chain(series, cuts, horizon) -> one forecast per cut
+UPDATERS = {
+    'ARIMA':   _arima_chain,
+    'Prophet': _prophet_chain,
+    'LSTM':    _lstm_chain,
+}
+
+
+def walk_forward_backtest(
+    series: pd.Series,
+    n_origins: int = 24,
+    horizon: int = 3,
+    step: int = 1,
+    models=('ARIMA', 'Prophet', 'LSTM'),
+    strategy: str = 'refit',
+    n_chains: int = 1,
+    max_workers: int | None = None,
+    threads_per_worker: int = 1,
+    registry_dir: str | None = None,
+    arima_order_dir: str | None = None,
+    registry_max_entries: int | None = DEFAULT_MAX_ENTRIES,
+    registry_max_bytes: int | None = DEFAULT_MAX_BYTES
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluate the models over `n_origins` rolling origins.
+
+    Args:
+        series: time-indexed series of counts.
+        n_origins, horizon, step: origins are `step` periods apart and each
+            forecasts the next `horizon` periods; the last origin ends
+            `horizon` periods before the end of the series.
+        models: model names, or for 'refit' a {name: forecaster} mapping and
+            for 'update' a {name: chain} mapping (see UPDATERS).
+        strategy: 'refit' (fit every fold from scratch) or 'update'
+            (fit once per chain, then update/warm-start fold to fold).
+        n_chains: for 'update', split the origins into this many contiguous
+            blocks per model, each starting with a full fit, to trade a
+            little extra fitting for more parallelism.
+        max_workers, threads_per_worker: process pool settings.
+        registry_dir: ModelRegistry directory for 'refit' folds, so re-running
+            a backtest only fits folds whose training data changed.
+        registry_max_entries, registry_max_bytes: registry LRU limits
+            (None: unlimited).
+        arima_order_dir: ArimaOrderCache directory for 'refit' folds. The
+            order is selected on the first cutoff (unless one found on no
+            more data is cached) and every fold refits only its coefficients.
+
+    Returns:
+        (predictions, metrics). `predictions` has one row per origin, step
+        and model (PREDICTION_COLUMNS); `metrics` is `evaluate_forecasts`
+        over all folds, with NaN metrics for models with NaN predictions.
+        A fold that raises gets NaN forecasts and its message in 'error'
+        (the first one per model is also in `metrics`); the others go on.
+    """
+    cuts = rolling_origins(len(series), n_origins, horizon, step)
+
+    with forecast_pool(max_workers, threads_per_worker) as pool:
+        if strategy == 'refit':
+            registry = (ModelRegistry(registry_dir, registry_max_entries, registry_max_bytes)
+                        if registry_dir else None)
+            orders   = None
+            if arima_order_dir and 'ARIMA' in models and not isinstance(models, dict):
+                # select the order once, on the first cutoff, before the fan-out;
+                # folds then only refit it and never write back (no look-ahead)
+                ArimaOrderCache(arima_order_dir).seed(series.name, series.values[:cuts[0]])
+                orders = ArimaOrderCache(arima_order_dir, n_jobs=threads_per_worker,
+                                         readonly=True)
+            models   = resolve_models(models, registry, orders)
+            futures = {
+                (name, cut): instrumentation.submit(pool, _refit_fold, series, cut, horizon, forecaster)
+                for name, forecaster in models.items() for cut in cuts
+            }
+            fold_preds, errors = {}, {}
+            for (name, cut), f in futures.items():
+                try:
+                    fold_preds[name, cut] = instrumentation.result(f)
+                except Exception as e:
+                    # one bad fold (e.g. a singular fit on a short window) costs only that fold
+                    print(f"Backtest fold {name} at origin {series.index[cut - 1]} failed: {e}")
+                    fold_preds[name, cut] = np.full(horizon, np.nan)
+                    errors[name, cut]     = str(e)
+        elif strategy == 'update':
+            models  = models if isinstance(models, dict) else {m: UPDATERS[m] for m in models}
+            blocks  = [[int(c) for c in b] for b in np.array_split(cuts, min(n_chains, len(cuts)))]
+            futures = {
+                (name, tuple(block)): instrumentation.submit(pool, _run_chain, name, chain,
+                                                             series, block, horizon)
+                for name, chain in models.items() for block in blocks
+            }
+            fold_preds, errors = {}, {}
+            for (name, block), f in futures.items():
+                try:
+                    preds = instrumentation.result(f)
+                except Exception as e:
+                    print(f"Backtest chain {name} from origin {series.index[block[0] - 1]} failed: {e}")
+                    preds = [np.full(horizon, np.nan)] * len(block)
+                    errors.update({(name, cut): str(e) for cut in block})
+                fold_preds.update({(name, cut): pred for cut, pred in zip(block, preds)})
+        else:
+            raise ValueError(f"Unknown strategy {strategy!r}; use 'refit' or 'update'")
+
+    records = []
+    for (name, cut), pred in fold_preds.items():
+        actual = series.iloc[cut:cut + horizon]
+        for i, (date, y, yhat) in enumerate(zip(actual.index, actual.values, pred)):
+            records.append({
+                'origin': series.index[cut - 1], 'step': i + 1, 'date': date,
+                'model': name, 'actual': y, 'forecast': yhat,
+                'error': errors.get((name, cut)),
+            })
+    predictions = (
+        pd.DataFrame(records, columns=PREDICTION_COLUMNS)
+        .sort_values(['model', 'origin', 'step'])
+        .reset_index(drop=True)
+    )
+
+    # all models share the same folds, so y_true lines up across models
+    by_model = {name: g for name, g in predictions.groupby('model', sort=False)}
+    y_true   = next(iter(by_model.values()))['actual'].values
+    y_preds  = {name: g['forecast'].values for name, g in by_model.items()}
+    valid    = {n: p for n, p in y_preds.items() if not np.isnan(p).any()}
+    skipped  = [n for n in y_preds if n not in valid]
+    if skipped:
+        print(f"Skipping models due to NaN predictions: {skipped}")
+    metrics = evaluate_forecasts(y_true, valid) if valid else pd.DataFrame(columns=['MAE', 'MAPE'])
+    metrics = metrics.reindex(list(y_preds)).rename_axis('model')
+    metrics['error'] = predictions.dropna(subset=['error']).groupby('model')['error'].first()
+    return predictions, metrics
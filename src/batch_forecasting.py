@@ -0,0 +1,168 @@
+# src/batch_forecasting.py
+#
+# Fan the forecasting model set out over many series (one per product, or
+# any other grouping column) on a process pool.
+
+import multiprocessing
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src                import instrumentation
+from src.arima_orders   import ArimaOrderCache
+from src.data_ingestion import resample_counts, train_test_split_ts
+from src.forecasting    import FORECASTERS
+from src.model_registry import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, ModelRegistry
+
+FORECAST_COLUMNS = ['series', 'date', 'model', 'actual', 'forecast', 'fit_seconds']
+
+
+def _init_worker(threads_per_worker: int, instrument: dict | None = None) -> None:
+    """
+    Keep each worker's TensorFlow thread pools small so N workers do not
+    oversubscribe the cores, and carry over the parent's instrumentation.
+    """
+    import sys
+    instrumentation.init_worker(instrument)
+    if 'tensorflow' in sys.modules:
+        import tensorflow as tf
+        tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+        tf.config.threading.set_inter_op_parallelism_threads(threads_per_worker)
+
+
+def forecast_pool(max_workers: int | None = None, threads_per_worker: int = 1) -> ProcessPoolExecutor:
+    """
+    Process pool for model fitting. Uses spawn: forking a parent that has
+    already initialised TensorFlow can hang.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(threads_per_worker, instrumentation.config()),
+    )
+
+
+def resolve_models(models, registry=None, order_cache=None) -> dict:
+    """
+    Accept model names from FORECASTERS or a {name: forecaster} mapping.
+    Named forecasters are bound to `registry` (a ModelRegistry) if given,
+    and ARIMA to `order_cache` (an ArimaOrderCache).
+    """
+    if isinstance(models, dict):
+        return models
+    resolved = {name: partial(FORECASTERS[name], registry=registry) for name in models}
+    if order_cache is not None and 'ARIMA' in resolved:
+        resolved['ARIMA'] = partial(resolved['ARIMA'], order_cache=order_cache)
+    return resolved
+
+
+def forecast_series(
+    key,
+    series: pd.Series,
+    test_periods: int,
+    models: dict
+) -> tuple[list[dict], float]:
+    """
+    Fit every model on one series and forecast its last `test_periods`
+    observations. Returns (records, wall_seconds); runs inside a worker.
+    """
+    t0 = time.perf_counter()
+    nonzero = series.to_numpy().nonzero()[0]
+    if len(nonzero):
+        series = series.iloc[nonzero[0]:]    # drop months before the series existed
+    train, test = train_test_split_ts(series, test_periods=test_periods)
+
+    records = []
+    with instrumentation.stage('forecast_series', series=key, rows=len(series), models=list(models)):
+        for name, forecaster in models.items():
+            t_model = time.perf_counter()
+            pred    = forecaster(train, len(test))
+            seconds = time.perf_counter() - t_model
+            for date, actual, yhat in zip(test.index, test.values, pred):
+                records.append({
+                    'series': key, 'date': date, 'model': name,
+                    'actual': actual, 'forecast': yhat, 'fit_seconds': seconds,
+                })
+    return records, time.perf_counter() - t0
+
+
+def forecast_panel(
+    counts: pd.DataFrame,
+    test_periods: int = 3,
+    models=('ARIMA', 'Prophet', 'LSTM'),
+    max_workers: int | None = None,
+    threads_per_worker: int = 1,
+    registry_dir: str | None = None,
+    arima_order_dir: str | None = None,
+    registry_max_entries: int | None = DEFAULT_MAX_ENTRIES,
+    registry_max_bytes: int | None = DEFAULT_MAX_BYTES
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Forecast every column of a period x series count frame in parallel.
+
+    Args:
+        counts: wide frame of counts, one column per series.
+        test_periods: trailing periods held out and forecast.
+        models: names from `FORECASTERS` or a {name: forecaster} mapping of
+            picklable callables forecaster(train, horizon) -> array.
+        max_workers: process pool size (default: number of CPUs).
+        threads_per_worker: TensorFlow threads per worker process.
+        registry_dir: ModelRegistry directory; series whose training data
+            has not changed load their fitted models instead of refitting.
+        registry_max_entries, registry_max_bytes: registry LRU limits
+            (None: unlimited).
+        arima_order_dir: ArimaOrderCache directory; ARIMA reuses each
+            series' previously selected order and only refits coefficients.
+
+    Returns:
+        (forecasts, summary). `forecasts` is a tidy frame with columns
+        FORECAST_COLUMNS; `summary` is indexed by series with the number of
+        observations, wall seconds and the error message of any series that
+        failed (failed series are skipped, the others are unaffected).
+    """
+    registry = ModelRegistry(registry_dir, registry_max_entries, registry_max_bytes) if registry_dir else None
+    # searches run inside pool workers: one job each, not a full-core search per worker
+    orders   = ArimaOrderCache(arima_order_dir, n_jobs=threads_per_worker) if arima_order_dir else None
+    models   = resolve_models(models, registry, orders)
+    records  = []
+    summary = {}
+    with forecast_pool(max_workers, threads_per_worker) as pool:
+        futures = {
+            instrumentation.submit(pool, forecast_series, key, counts[key], test_periods, models): key
+            for key in counts.columns
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                rows, seconds = instrumentation.result(future)
+                records.extend(rows)
+                summary[key] = {'n_obs': len(counts[key]), 'seconds': seconds, 'error': None}
+            except Exception as e:
+                print(f"Forecasting failed for {key!r}: {e}")
+                summary[key] = {'n_obs': len(counts[key]), 'seconds': np.nan, 'error': str(e)}
+
+    forecasts = (
+        pd.DataFrame(records, columns=FORECAST_COLUMNS)
+        .sort_values(['series', 'model', 'date'])
+        .reset_index(drop=True)
+    )
+    summary = pd.DataFrame.from_dict(summary, orient='index').loc[list(counts.columns)]
+    summary.index.name = 'series'
+    return forecasts, summary
+
+
+def forecast_by(
+    df: pd.DataFrame,
+    by: str = 'product',
+    freq: str = 'M',
+    **kwargs
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Group a date-indexed complaints frame (from `load_complaints`) by `by`,
+    count per `freq` period and forecast every group with `forecast_panel`.
+    """
+    return forecast_panel(resample_counts(df, freq=freq, by=by), **kwargs)
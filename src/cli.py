@@ -0,0 +1,248 @@
+# src/cli.py
+#
+# Command-line entry point:
+#
+#   python -m src.cli ingest   data.csv [--store DIR] [--cube DIR]
+#   python -m src.cli forecast data.csv --models arima,prophet [--by product]
+#   python -m src.cli alerts   data.csv [--by product] [--out alerts.csv]
+#   python -m src.cli backtest data.csv --models arima --origins 24
+#
+# Only argparse is imported up front; each subcommand imports what it
+# needs when it runs, and model backends (pmdarima, Prophet, TensorFlow)
+# are only loaded for the models actually requested.
+
+import argparse
+import os
+import sys
+
+# CLI spelling -> FORECASTERS name
+MODEL_NAMES = {'arima': 'ARIMA', 'prophet': 'Prophet', 'lstm': 'LSTM'}
+
+
+def parse_models(value: str) -> list[str]:
+    names = [m.strip().lower() for m in value.split(',') if m.strip()]
+    unknown = [m for m in names if m not in MODEL_NAMES]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"unknown model(s) {unknown}; choose from {','.join(MODEL_NAMES)}"
+        )
+    return [MODEL_NAMES[m] for m in names]
+
+
+def _load_counts(args, by=None):
+    """
+    Monthly counts from the aggregate store if given, else from the CSV
+    (or its Parquet cache).
+    """
+    if getattr(args, 'store', None):
+        from src.delta_ingestion import ingest_delta, read_counts
+        ingest_delta(args.csv, args.store)
+        return read_counts(args.store, freq=args.freq, by=by)
+    from src.data_ingestion import count_complaints
+    return count_complaints(args.csv, freq=args.freq, by=by)
+
+
+def _registry_limits(args) -> dict:
+    return {
+        'registry_max_entries': args.registry_max_entries or None,
+        'registry_max_bytes':   int(args.registry_max_mb * 2**20) or None,
+    }
+
+
+def _write(df, path: str | None, label: str) -> None:
+    if path:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        df.to_csv(path, index=False)
+        print(f"{label} saved to {path}")
+
+
+def _build_cache(args) -> None:
+    from src.parquet_cache import build_parquet_cache, cache_is_fresh, default_cache_dir
+    cache_dir = args.cache_dir or default_cache_dir(args.csv)
+    if cache_is_fresh(args.csv, cache_dir):
+        print(f"Parquet cache in {cache_dir} is up to date")
+    else:
+        print(f"Parquet cache written to {build_parquet_cache(args.csv, cache_dir)}")
+
+
+def cmd_ingest(args) -> None:
+    if not args.no_cache:
+        try:
+            import pyarrow.dataset  # noqa: F401
+        except ImportError:
+            print("pyarrow is not installed; skipping the Parquet cache")
+        else:
+            _build_cache(args)
+    if args.store:
+        from src.delta_ingestion import ingest_delta
+        n = ingest_delta(args.csv, args.store, cache_dir=args.cache_dir)
+        print(f"Ingested {n} new complaints into {args.store}")
+    if args.cube:
+        from src.cube import build_cube
+        print(f"Cube written to {build_cube(args.csv, args.cube, freq=args.freq)}")
+
+
+def cmd_forecast(args) -> None:
+    from src.batch_forecasting import forecast_panel
+
+    counts = _load_counts(args, by=args.by)
+    if not args.by:
+        counts = counts.to_frame('total')
+    forecasts, summary = forecast_panel(
+        counts,
+        test_periods=args.test_periods,
+        models=args.models,
+        max_workers=args.workers,
+        registry_dir=args.registry,
+        arima_order_dir=args.arima_orders,
+        **_registry_limits(args),
+    )
+    if args.global_model:
+        import pandas as pd
+        from src.global_model import forecast_global
+        name = {'lstm': 'Global LSTM', 'transformer': 'Global Transformer'}[args.global_model]
+        forecasts = pd.concat([forecasts, forecast_global(
+            counts, args.test_periods, model_name=name, architecture=args.global_model,
+        )], ignore_index=True)
+    from src.utils import evaluate_forecasts
+    for key, g in forecasts.groupby('series', sort=False):
+        preds = {m: p['forecast'].values for m, p in g.groupby('model', sort=False)
+                 if p['forecast'].notna().all()}
+        if not preds:
+            print(f"\nWarning: every model failed for {key!r}; skipping its evaluation")
+            continue
+        print(f"\n{key}:")
+        print(evaluate_forecasts(g.groupby('date')['actual'].first().values, preds))
+    failed = summary[summary['error'].notna()]
+    if len(failed):
+        print(f"\nFailed series: {list(failed.index)}")
+    _write(forecasts, args.out, "Forecasts")
+
+
+def cmd_alerts(args) -> None:
+    from src.anomaly_detection import generate_alerts_report, generate_panel_alerts
+
+    counts = _load_counts(args, by=args.by)
+    kwargs = dict(window=args.window, z_thresh=args.z_thresh, model=args.model,
+                  pen=args.pen, cp_method=args.cp_method)
+    if args.by:
+        alerts = generate_panel_alerts(counts, max_workers=args.workers, **kwargs)
+    else:
+        alerts = generate_alerts_report(counts, since=args.since, **kwargs)
+    print(f"Detected {len(alerts)} anomalies/change-points")
+    print(alerts.to_string(index=False))
+    _write(alerts, args.out, "Alerts report")
+
+
+def cmd_backtest(args) -> None:
+    from src.backtesting import walk_forward_backtest
+
+    series = _load_counts(args).rename('total')     # names the ARIMA order cache entry
+    predictions, metrics = walk_forward_backtest(
+        series,
+        n_origins=args.origins,
+        horizon=args.horizon,
+        step=args.step,
+        models=args.models,
+        strategy=args.strategy,
+        n_chains=args.chains,
+        max_workers=args.workers,
+        registry_dir=args.registry,
+        arima_order_dir=args.arima_orders,
+        **_registry_limits(args),
+    )
+    print(metrics)
+    _write(predictions, args.out, "Backtest predictions")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from src.model_registry import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES
+
+    parser = argparse.ArgumentParser(prog='python -m src.cli',
+                                     description='Complaint volume forecasting and alerting')
+    parser.add_argument('--metrics-out', help='record per-stage timings and write them here '
+                                               '(.prom: Prometheus textfile, else JSON)')
+    parser.add_argument('--log-metrics', action='store_true',
+                        help='record per-stage timings and log each as a JSON line')
+    parser.add_argument('--profile-stage', help='capture one stage, e.g. forecast.ARIMA')
+    parser.add_argument('--profile-mode', default='cprofile', choices=['cprofile', 'tracemalloc'])
+    parser.add_argument('--profile-dir', default='profiles')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('csv', help='cleaned complaints CSV')
+    common.add_argument('--freq', default='M', help='count period (default: M)')
+    common.add_argument('--workers', type=int, default=None, help='process pool size')
+
+    models = argparse.ArgumentParser(add_help=False)
+    models.add_argument('--models', type=parse_models, default=list(MODEL_NAMES.values()),
+                        help='comma-separated subset of arima,prophet,lstm')
+    models.add_argument('--registry', help='ModelRegistry directory')
+    models.add_argument('--registry-max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f'evict least-recently-used models past this many '
+                             f'(default: {DEFAULT_MAX_ENTRIES}; 0: unlimited)')
+    models.add_argument('--registry-max-mb', type=float, default=DEFAULT_MAX_BYTES / 2**20,
+                        help=f'evict least-recently-used models past this many MB '
+                             f'(default: {DEFAULT_MAX_BYTES // 2**20}; 0: unlimited)')
+    models.add_argument('--arima-orders', help='ArimaOrderCache directory')
+    models.add_argument('--store', help='aggregate store directory (delta ingestion)')
+    models.add_argument('--out', help='write the results to this CSV')
+
+    p = sub.add_parser('ingest', parents=[common], help='build the Parquet cache, store and/or cube')
+    p.add_argument('--cache-dir', help='Parquet cache directory (default: next to the CSV)')
+    p.add_argument('--no-cache', action='store_true', help='skip the Parquet cache')
+    p.add_argument('--store', help='fold new rows into this aggregate store')
+    p.add_argument('--cube', help='(re)build the dashboard cube in this directory')
+    p.set_defaults(func=cmd_ingest)
+
+    p = sub.add_parser('forecast', parents=[common, models], help='fit and evaluate forecasters')
+    p.add_argument('--by', help='forecast one series per value of this column, e.g. product')
+    p.add_argument('--test-periods', type=int, default=3)
+    p.add_argument('--global-model', choices=['lstm', 'transformer'],
+                   help='also train one network across all series and compare it')
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser('alerts', parents=[common], help='spike and change-point alerts')
+    p.add_argument('--by', help='one series per value of this column, e.g. product')
+    p.add_argument('--store', help='aggregate store directory (delta ingestion)')
+    p.add_argument('--window', type=int, default=12)
+    p.add_argument('--z-thresh', type=float, default=3.0)
+    p.add_argument('--model', default='rbf', help='change-point cost model')
+    p.add_argument('--pen', type=float, default=10)
+    p.add_argument('--cp-method', default='pelt', choices=['pelt', 'linear', 'binseg'])
+    p.add_argument('--since', help='only search change points after this date (single series)')
+    p.add_argument('--out', default=os.path.join('reports', 'alerts_report.csv'))
+    p.set_defaults(func=cmd_alerts)
+
+    p = sub.add_parser('backtest', parents=[common, models], help='walk-forward backtest')
+    p.add_argument('--origins', type=int, default=24)
+    p.add_argument('--horizon', type=int, default=3)
+    p.add_argument('--step', type=int, default=1)
+    p.add_argument('--strategy', default='refit', choices=['refit', 'update'])
+    p.add_argument('--chains', type=int, default=1)
+    p.set_defaults(func=cmd_backtest)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    instrument = args.metrics_out or args.log_metrics or args.profile_stage
+    if instrument:
+        from src import instrumentation
+        if args.log_metrics:
+            import logging
+            logging.basicConfig(level=logging.INFO, format='%(message)s')
+        instrumentation.enable(log=args.log_metrics, profile_stage=args.profile_stage,
+                               profile_mode=args.profile_mode, profile_dir=args.profile_dir)
+    args.func(args)
+    if instrument:
+        print("\nStage timings:")
+        print(instrumentation.summary())
+        if args.metrics_out:
+            instrumentation.export(args.metrics_out)
+            print(f"Stage metrics saved to {args.metrics_out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
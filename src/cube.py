@@ -0,0 +1,181 @@
+# src/cube.py
+#
+# Pre-aggregated cube behind the dashboard: complaint counts by
+# period x product x state, plus the stored forecasts and alerts, so that
+# no widget interaction ever touches the raw complaints. Layout:
+#
+#   <cube_dir>/manifest.json       version, freq, product -> file index
+#   <cube_dir>/totals.parquet      period x product counts (all states)
+#   <cube_dir>/counts/<i>.parquet  period x state counts of one product
+#   <cube_dir>/forecasts.parquet   series, date, model, actual, forecast
+#   <cube_dir>/alerts.parquet      series, date, alert_type
+#
+# `version` changes on every write, so readers can key their caches on it.
+# Requires pyarrow.
+
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from src.anomaly_detection import generate_panel_alerts
+from src.data_ingestion    import DATE_COLUMN, fill_missing_keys, load_complaints, resample_counts
+
+MANIFEST_FILE = 'manifest.json'
+TOTAL_SERIES  = 'All products'
+FORECAST_COLUMNS = ['series', 'date', 'model', 'actual', 'forecast']
+ALERT_COLUMNS    = ['series', 'date', 'alert_type']
+
+
+def read_manifest(cube_dir: str) -> dict:
+    with open(os.path.join(cube_dir, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def cube_version(cube_dir: str) -> str:
+    """
+    Version string of the cube; changes whenever any part is rewritten.
+    """
+    return read_manifest(cube_dir)['version']
+
+
+def _write_manifest(cube_dir: str, manifest: dict) -> None:
+    manifest = {**manifest, 'updated_at': time.time()}
+    manifest['version'] = hashlib.sha256(
+        json.dumps({k: v for k, v in manifest.items() if k != 'version'},
+                   sort_keys=True).encode()
+    ).hexdigest()[:16]
+    tmp = os.path.join(cube_dir, MANIFEST_FILE + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(cube_dir, MANIFEST_FILE))
+
+
+def _write_frame(df: pd.DataFrame, path: str) -> None:
+    tmp = path + '.tmp'
+    df.to_parquet(tmp)
+    os.replace(tmp, path)
+
+
+def build_cube(
+    csv_path: str,
+    cube_dir: str,
+    freq: str = 'M',
+    alerts: bool = True,
+    **alert_kwargs
+) -> str:
+    """
+    Aggregate the complaints into the cube under `cube_dir`.
+
+    Args:
+        csv_path: cleaned complaints CSV (a fresh Parquet cache is used
+            when present).
+        cube_dir: output directory.
+        freq: period of the counts.
+        alerts: also precompute spike/change-point alerts for every product
+            and the total with `generate_panel_alerts` (`alert_kwargs` are
+            passed through).
+
+    Returns:
+        The cube directory.
+    """
+    df     = load_complaints(csv_path, usecols=['product', 'state'], chunksize=500_000)
+    # complaints without a product or state are counted under 'Unknown', so
+    # totals and the 'All products' series match the raw complaint count
+    df     = fill_missing_keys(df, ['product', 'state'])
+    counts = (
+        df.groupby([pd.Grouper(freq=freq), 'product', 'state'], observed=True)
+        .size()
+        .rename('count')
+    )
+    os.makedirs(os.path.join(cube_dir, 'counts'), exist_ok=True)
+
+    totals = resample_counts(df, freq=freq, by='product')
+    totals.columns = totals.columns.astype(str)
+    totals.index.name = DATE_COLUMN
+    _write_frame(totals, os.path.join(cube_dir, 'totals.parquet'))
+
+    files = {}
+    for i, (product, by_state) in enumerate(counts.groupby(level=1, observed=True)):
+        wide = by_state.droplevel(1).unstack(fill_value=0).reindex(totals.index, fill_value=0)
+        wide.columns = wide.columns.astype(str)
+        files[str(product)] = f'counts/{i:04d}.parquet'
+        _write_frame(wide, os.path.join(cube_dir, files[str(product)]))
+
+    manifest = {'source': os.path.abspath(csv_path), 'freq': freq, 'products': files}
+    _write_manifest(cube_dir, manifest)
+
+    if alerts:
+        panel = totals.assign(**{TOTAL_SERIES: totals.sum(axis=1)})
+        write_alerts(cube_dir, generate_panel_alerts(panel, **alert_kwargs))
+    return cube_dir
+
+
+def _replace_series(cube_dir: str, name: str, df: pd.DataFrame, columns: list[str]) -> None:
+    """
+    Write `df` into <name>.parquet, replacing earlier rows of the same series.
+    """
+    path = os.path.join(cube_dir, name + '.parquet')
+    df   = df[columns]
+    if os.path.exists(path):
+        old = pd.read_parquet(path)
+        old = old[~old['series'].isin(df['series'].unique())]
+        df  = pd.concat([old, df], ignore_index=True) if len(old) else df
+    _write_frame(df.sort_values(['series', 'date']).reset_index(drop=True), path)
+    _write_manifest(cube_dir, read_manifest(cube_dir))
+
+
+def write_forecasts(cube_dir: str, forecasts: pd.DataFrame) -> None:
+    """
+    Store forecasts (FORECAST_COLUMNS, e.g. from `forecast_panel`) in the cube.
+    """
+    forecasts = forecasts.assign(series=forecasts['series'].astype(str))
+    _replace_series(cube_dir, 'forecasts', forecasts, FORECAST_COLUMNS)
+
+
+def write_alerts(cube_dir: str, alerts: pd.DataFrame) -> None:
+    """
+    Store alerts (ALERT_COLUMNS, e.g. from `generate_panel_alerts`) in the cube.
+    """
+    alerts = alerts.assign(series=alerts['series'].astype(str))
+    _replace_series(cube_dir, 'alerts', alerts, ALERT_COLUMNS)
+
+
+def load_totals(cube_dir: str) -> pd.DataFrame:
+    """
+    Period x product counts summed over states.
+    """
+    return pd.read_parquet(os.path.join(cube_dir, 'totals.parquet'))
+
+
+def load_product_counts(cube_dir: str, product: str) -> pd.DataFrame:
+    """
+    Period x state counts for one product (only that product's file is read).
+    """
+    path = read_manifest(cube_dir)['products'][product]
+    return pd.read_parquet(os.path.join(cube_dir, path))
+
+
+def _load_series_rows(cube_dir: str, name: str, columns: list[str], series=None) -> pd.DataFrame:
+    path = os.path.join(cube_dir, name + '.parquet')
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    filters = [('series', '==', str(series))] if series is not None else None
+    return pd.read_parquet(path, filters=filters)
+
+
+def load_forecasts(cube_dir: str, series=None) -> pd.DataFrame:
+    return _load_series_rows(cube_dir, 'forecasts', FORECAST_COLUMNS, series)
+
+
+def load_alerts(cube_dir: str, series=None) -> pd.DataFrame:
+    return _load_series_rows(cube_dir, 'alerts', ALERT_COLUMNS, series)
+
+
+if __name__ == "__main__":
+    # python -m src.cube path/to/cleaned_consumer_complaints.csv cube_dir
+    import sys
+    out = build_cube(sys.argv[1], sys.argv[2])
+    print(f"Cube written to {out}")
@@ -1,16 +1,231 @@
 # src/data_ingestion.py
 import pandas as pd
+from pandas.api.types import union_categoricals
 
-def load_complaints(csv_path: str) -> pd.DataFrame:
+DATE_COLUMN = 'date_received'
+
+# Low-cardinality text columns stored as pandas categoricals by the
+# streaming loader (a few hundred distinct values over millions of rows).
+CATEGORY_COLUMNS = ['product', 'issue', 'state', 'company']
+
+# Group key for rows whose key column is missing (see fill_missing_keys).
+MISSING_KEY = 'Unknown'
+
+
+def iter_complaint_chunks(
+    csv_path: str,
+    usecols=None,
+    chunksize: int = 500_000,
+    dtype: dict | None = None
+):
+    """
+    Iterate over the complaints CSV in chunks of `chunksize` rows, reading
+    only `usecols` (the date column is always included) and parsing the
+    CATEGORY_COLUMNS as categoricals. `dtype` adds read_csv dtypes for
+    other columns.
+    """
+    if usecols is not None:
+        usecols = list(dict.fromkeys([DATE_COLUMN, *usecols]))
+    dtype = {
+        **(dtype or {}),
+        **{col: 'category' for col in CATEGORY_COLUMNS if usecols is None or col in usecols},
+    }
+    return pd.read_csv(
+        csv_path,
+        usecols=usecols,
+        dtype=dtype,
+        parse_dates=[DATE_COLUMN],
+        chunksize=chunksize,
+    )
+
+
+def _concat_chunks(chunks: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate chunks, unioning the categories of categorical columns so
+    they stay categorical (plain pd.concat falls back to object dtype when
+    the chunks saw different categories).
+    """
+    if not chunks:
+        return pd.DataFrame()
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            cats = union_categoricals([c[col] for c in chunks]).categories
+            for c in chunks:
+                c[col] = c[col].cat.set_categories(cats)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow.dataset  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _fresh_cache_dir(csv_path: str, cache_dir: str | None, use_cache: bool) -> str | None:
+    """
+    Return the Parquet cache directory to read from, or None if the cache
+    is disabled, missing, older than the CSV, or pyarrow is not installed.
+    """
+    if not use_cache or not _pyarrow_available():
+        return None
+    from src.parquet_cache import cache_is_fresh, default_cache_dir
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    return cache_dir if cache_is_fresh(csv_path, cache_dir) else None
+
+
+def _filter_rows(df: pd.DataFrame, start=None, end=None, products=None) -> pd.DataFrame:
+    """
+    Apply the date-range (inclusive) and product filters to a chunk read
+    from CSV, mirroring what the Parquet cache does with partitions.
+    """
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df[DATE_COLUMN] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df[DATE_COLUMN] <= pd.Timestamp(end)
+    if products is not None:
+        mask &= df['product'].isin(list(products))
+    return df if mask.all() else df[mask]
+
+
+def load_complaints(
+    csv_path: str,
+    usecols: list[str] | None = None,
+    chunksize: int | None = None,
+    start=None,
+    end=None,
+    products: list[str] | None = None,
+    cache_dir: str | None = None,
+    use_cache: bool = True
+) -> pd.DataFrame:
     """
     Load the cleaned complaints CSV, parse dates, set index, sort.
+
+    With `chunksize` set, the file is streamed in chunks of that many rows,
+    only `usecols` are kept and product/issue/state/company are stored as
+    categoricals, which keeps peak memory well below the one-shot read.
+
+    If a Parquet cache built by `src.parquet_cache.build_parquet_cache` is
+    present and not older than the CSV, it is read instead; `start`/`end`
+    (inclusive) and `products` then skip non-matching partitions entirely.
     """
-    df = pd.read_csv(csv_path, parse_dates=['date_received'])
-    df = df.set_index('date_received').sort_index()
+    cached = _fresh_cache_dir(csv_path, cache_dir, use_cache)
+    if cached is not None:
+        from src.parquet_cache import read_parquet_cache
+        return read_parquet_cache(cached, usecols, start=start, end=end, products=products)
+
+    filtered = start is not None or end is not None or products is not None
+    extra    = []
+    if products is not None and usecols is not None and 'product' not in usecols:
+        extra   = ['product']     # needed for filtering only
+        usecols = [*usecols, 'product']
+    if chunksize is None:
+        if usecols is not None:
+            usecols = list(dict.fromkeys([DATE_COLUMN, *usecols]))
+        df = pd.read_csv(csv_path, usecols=usecols, parse_dates=[DATE_COLUMN])
+        if filtered:
+            df = _filter_rows(df, start, end, products)
+    else:
+        chunks = iter_complaint_chunks(csv_path, usecols, chunksize)
+        if filtered:
+            chunks = (_filter_rows(c, start, end, products) for c in chunks)
+        df = _concat_chunks(list(chunks))
+    df = df.drop(columns=extra).set_index(DATE_COLUMN).sort_index()
+    return df
+
+
+def fill_missing_keys(
+    df: pd.DataFrame,
+    columns: list[str],
+    placeholder: str = MISSING_KEY
+) -> pd.DataFrame:
+    """
+    Replace missing values of the key `columns` by `placeholder` (added as
+    a category where needed), so groupbys over them keep every row.
+    """
+    df = df.copy()
+    for col in columns:
+        if not df[col].isna().any():
+            continue
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and placeholder not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([placeholder])
+        df[col] = df[col].fillna(placeholder)
     return df
 
+
+def resample_counts(
+    df: pd.DataFrame,
+    freq: str = 'M',
+    by: str | None = None
+) -> pd.Series | pd.DataFrame:
+    """
+    Count complaints per `freq` period of a date-indexed frame.
+
+    Without `by` this is `df.resample(freq).size()`; with `by` it returns a
+    wide frame of counts with one column per value of `by`.
+    """
+    if by is None:
+        return df.resample(freq).size()
+    counts = df.groupby([pd.Grouper(freq=freq), by], observed=True).size()
+    return _widen_counts(counts, freq)
+
+
+def _widen_counts(counts: pd.Series, freq: str) -> pd.DataFrame:
+    """
+    Turn (period, key) counts into a gap-free period x key frame.
+    """
+    wide = counts.unstack(fill_value=0).resample(freq).sum()
+    wide.columns = wide.columns.astype(object)
+    return wide.astype('int64')
+
+
+def count_complaints(
+    csv_path: str,
+    freq: str = 'M',
+    by: str | None = None,
+    chunksize: int = 500_000,
+    cache_dir: str | None = None,
+    use_cache: bool = True
+) -> pd.Series | pd.DataFrame:
+    """
+    Stream the CSV and aggregate straight to per-period complaint counts,
+    never holding more than one chunk in memory.
+
+    The result is identical to `resample_counts(load_complaints(csv_path),
+    freq, by)`, i.e. `load_complaints(...).resample(freq).size()` when `by`
+    is None. `freq` must be a calendar-anchored frequency ('D', 'W', 'M',
+    ...) so that bin edges do not depend on where a chunk starts. A fresh
+    Parquet cache is used when available (only the needed columns are read).
+    """
+    usecols = [by] if by is not None else []
+    cached  = _fresh_cache_dir(csv_path, cache_dir, use_cache)
+    if cached is not None:
+        from src.parquet_cache import read_parquet_cache
+        return resample_counts(read_parquet_cache(cached, usecols), freq, by)
+
+    keys  = [pd.Grouper(key=DATE_COLUMN, freq=freq)] + ([by] if by else [])
+    total = None
+    for chunk in iter_complaint_chunks(csv_path, usecols=usecols, chunksize=chunksize):
+        counts = chunk.groupby(keys, observed=True).size()
+        if by is not None:
+            counts.index = counts.index.set_levels(
+                counts.index.levels[1].astype(object), level=1
+            )
+        total = counts if total is None else total.add(counts, fill_value=0)
+
+    if total is None:
+        raise ValueError(f"No rows found in {csv_path}")
+    if by is not None:
+        return _widen_counts(total.astype('int64'), freq)
+    series = total.astype('int64').resample(freq).sum()
+    series.index.name = DATE_COLUMN
+    return series
+
+
 def train_test_split_ts(
-    series: pd.Series, 
+    series: pd.Series,
     test_periods: int
 ) -> tuple[pd.Series, pd.Series]:
     """
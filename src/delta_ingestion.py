@@ -0,0 +1,259 @@
+# src/delta_ingestion.py
+#
+# Incremental ingestion: fold only the complaints that arrived since the
+# last run into a persisted per-product, per-day count table, so a nightly
+# refresh costs time proportional to the day's delta.
+#
+# <store_dir>/state.json         high-water mark (byte offset, last id/date)
+# <store_dir>/daily_counts.csv   date_received, product, count
+
+import hashlib
+import io
+import json
+import os
+import sys
+
+import pandas as pd
+
+from src.data_ingestion import (
+    CATEGORY_COLUMNS, DATE_COLUMN, _widen_counts, fill_missing_keys, iter_complaint_chunks
+)
+
+ID_COLUMN    = 'complaint_id'
+STATE_FILE   = 'state.json'
+COUNTS_FILE  = 'daily_counts.csv'
+_TAIL_BYTES  = 4096     # bytes before the offset fingerprinted to detect rewrites
+
+
+def read_state(store_dir: str) -> dict | None:
+    """
+    Return the high-water mark of the store, or None before the first run.
+    """
+    path = os.path.join(store_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_atomic(path: str, write) -> None:
+    tmp = path + '.tmp'
+    with open(tmp, 'w', newline='') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def load_daily_counts(store_dir: str) -> pd.DataFrame:
+    """
+    Load the persisted per-product, per-day counts
+    (columns: date_received, product, count).
+    """
+    path = os.path.join(store_dir, COUNTS_FILE)
+    if not os.path.exists(path):
+        return pd.DataFrame({
+            DATE_COLUMN: pd.Series(dtype='datetime64[ns]'),
+            'product':   pd.Series(dtype=object),
+            'count':     pd.Series(dtype='int64'),
+        })
+    return pd.read_csv(path, parse_dates=[DATE_COLUMN], dtype={'product': object})
+
+
+def read_counts(
+    store_dir: str,
+    freq: str = 'M',
+    by: str | None = None
+) -> pd.Series | pd.DataFrame:
+    """
+    Per-period complaint counts from the aggregate store, in the same shape
+    as `count_complaints(csv_path, freq, by)`. Only `by='product'` is stored.
+    """
+    if by not in (None, 'product'):
+        raise ValueError(f"Aggregate store only holds per-product counts, not {by!r}")
+    counts = load_daily_counts(store_dir)
+    if counts.empty:
+        raise ValueError(f"Aggregate store {store_dir} is empty; run ingest_delta first")
+    if by is None:
+        series = counts.groupby(DATE_COLUMN)['count'].sum().resample(freq).sum()
+        return series.astype('int64').rename(None)
+    daily = counts.set_index([DATE_COLUMN, 'product'])['count']
+    return _widen_counts(daily, freq)
+
+
+def _tail_hash(path: str, offset: int) -> str:
+    with open(path, 'rb') as f:
+        f.seek(max(offset - _TAIL_BYTES, 0))
+        return hashlib.sha1(f.read(offset - max(offset - _TAIL_BYTES, 0))).hexdigest()
+
+
+def _appended_rows(source_path: str, state: dict, size: int):
+    """
+    Parse only the bytes appended to `source_path` since the last run.
+    Returns (chunks, new_offset); the new offset stops at the last complete
+    line so a half-written row is picked up next time.
+    """
+    with open(source_path, 'rb') as f:
+        f.seek(state['offset'])
+        data = f.read(size - state['offset'])
+    data = data[:data.rfind(b'\n') + 1]
+    if not data.strip():
+        return [], state['offset']
+    from src.parquet_cache import csv_dtypes
+    dtype = {**csv_dtypes(state['columns']),
+             **{c: 'category' for c in CATEGORY_COLUMNS if c in state['columns']}}
+    chunk = pd.read_csv(
+        io.BytesIO(data), header=None, names=state['columns'],
+        dtype=dtype, parse_dates=[DATE_COLUMN],
+    )
+    return [chunk], state['offset'] + len(data)
+
+
+def _is_append_of(source_path: str, state: dict | None, size: int) -> bool:
+    """
+    True if `source_path` is the file the store last read and it has only
+    grown since (the bytes before the old offset are unchanged).
+    """
+    return (
+        state is not None
+        and state['source'] == os.path.abspath(source_path)
+        and size >= state['offset']
+        and _tail_hash(source_path, state['offset']) == state['tail_hash']
+    )
+
+
+def _after_high_water_mark(chunk: pd.DataFrame, state: dict | None) -> pd.DataFrame:
+    """
+    Drop rows already counted: by complaint id when the file has one,
+    otherwise by date received.
+    """
+    if state is None:
+        return chunk
+    if ID_COLUMN in chunk.columns and state.get('last_id') is not None:
+        return chunk[chunk[ID_COLUMN] > state['last_id']]
+    if state.get('last_date') is not None:
+        return chunk[chunk[DATE_COLUMN] > pd.Timestamp(state['last_date'])]
+    return chunk
+
+
+def ingest_delta(
+    source_path: str,
+    store_dir: str,
+    chunksize: int = 500_000,
+    cache_dir: str | None = None
+) -> int:
+    """
+    Fold the complaints in `source_path` that are newer than the store's
+    high-water mark into the per-product, per-day count table.
+
+    If `source_path` is the same CSV as last time and has only been appended
+    to, parsing starts at the stored byte offset. Any other file (a rewritten
+    snapshot or a nightly delta extract) is scanned and filtered by the last
+    complaint id / date seen. When `cache_dir` holds a Parquet cache built by
+    `src.parquet_cache`, the new rows are appended to it as extra files.
+
+    Returns the number of new rows ingested.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    state = read_state(store_dir)
+    size  = os.path.getsize(source_path)
+
+    appending = _is_append_of(source_path, state, size)
+    if appending:
+        chunks, offset = _appended_rows(source_path, state, size)
+        columns = state['columns']
+    else:
+        chunks  = (
+            _after_high_water_mark(c, state)
+            for c in iter_complaint_chunks(source_path, chunksize=chunksize)
+        )
+        offset  = size
+        columns = list(pd.read_csv(source_path, nrows=0).columns)
+
+    counts    = load_daily_counts(store_dir).set_index([DATE_COLUMN, 'product'])['count']
+    last_id   = state.get('last_id') if state else None
+    last_date = state.get('last_date') if state else None
+    new_rows  = 0
+    for i, chunk in enumerate(chunks):
+        if chunk.empty:
+            continue
+        new_rows += len(chunk)
+        # a missing product is stored as 'Unknown': NaN keys would not line up
+        # with themselves in counts.add() and be written twice
+        keyed = fill_missing_keys(chunk, ['product'])
+        delta = (
+            keyed
+            .groupby(
+                [keyed[DATE_COLUMN].dt.normalize(), keyed['product'].astype(object)],
+                dropna=False,
+            )
+            .size()
+        )
+        delta.index.names = [DATE_COLUMN, 'product']
+        counts = counts.add(delta, fill_value=0) if len(counts) else delta
+        if ID_COLUMN in chunk.columns:
+            last_id = max(int(chunk[ID_COLUMN].max()), last_id or 0)
+        chunk_last = chunk[DATE_COLUMN].max()
+        if pd.notna(chunk_last):
+            last_date = max(chunk_last, pd.Timestamp(last_date or chunk_last)).isoformat()
+        if cache_dir is not None and appending:
+            _append_to_cache(chunk, cache_dir, state['offset'], f'delta-{offset}-{i:05d}')
+
+    if new_rows:
+        table = counts.astype('int64').rename('count').reset_index().sort_values(
+            [DATE_COLUMN, 'product']
+        )
+        _write_atomic(
+            os.path.join(store_dir, COUNTS_FILE),
+            lambda f: table.to_csv(f, index=False, date_format='%Y-%m-%d'),
+        )
+    if cache_dir is not None and appending:
+        _advance_cache(source_path, cache_dir, state['offset'], offset)
+
+    new_state = {
+        'source':    os.path.abspath(source_path),
+        'offset':    offset,
+        'tail_hash': _tail_hash(source_path, offset),
+        'columns':   columns,
+        'last_id':   last_id,
+        'last_date': last_date,
+    }
+    _write_atomic(
+        os.path.join(store_dir, STATE_FILE),
+        lambda f: json.dump(new_state, f, indent=2),
+    )
+    return new_rows
+
+
+def _append_to_cache(
+    chunk: pd.DataFrame,
+    cache_dir: str,
+    covered: int,
+    basename: str
+) -> None:
+    """
+    Append new rows to the Parquet cache, but only if the cache covers the
+    source exactly up to the store's previous offset (anything else would
+    leave a gap; a stale cache is simply rebuilt).
+    """
+    from src.parquet_cache import read_manifest, write_partitions
+    manifest = read_manifest(cache_dir)
+    if manifest is not None and manifest.get('source_size') == covered:
+        write_partitions(chunk, cache_dir, basename)
+
+
+def _advance_cache(source_path: str, cache_dir: str, covered: int, offset: int) -> None:
+    """
+    Mark the Parquet cache as current with the source once the delta has
+    been appended to it.
+    """
+    from src.parquet_cache import read_manifest, write_manifest
+    manifest = read_manifest(cache_dir)
+    if manifest is not None and manifest.get('source_size') == covered:
+        manifest['source_size']  = offset
+        manifest['source_mtime'] = os.path.getmtime(source_path)
+        write_manifest(cache_dir, manifest)
+
+
+if __name__ == "__main__":
+    # python -m src.delta_ingestion <source.csv> <store_dir> [cache_dir]
+    n = ingest_delta(sys.argv[1], sys.argv[2], cache_dir=sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"Ingested {n} new complaints into {sys.argv[2]}")
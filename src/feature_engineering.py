@@ -1,6 +1,8 @@
 # src/feature_engineering.py
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 def create_time_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -16,13 +18,37 @@ def create_time_features(df: pd.DataFrame) -> pd.DataFrame:
     df['week_of_year'] = df.index.isocalendar().week.astype(int)
     return df
 
-def series_to_supervised(series: pd.Series, lags: int) -> pd.DataFrame:
+def series_to_supervised(series: pd.Series, lags: int, horizon: int = 1) -> pd.DataFrame:
     """
     Turns a univariate series into a supervised-learning DataFrame
     with columns [lag_0 (y), lag_1, ..., lag_n].
+    With horizon > 1, columns lead_1 .. lead_{horizon-1} hold the later
+    targets y(t+1) .. y(t+horizon-1) for direct multi-step models.
     """
     data = {}
     for i in range(lags + 1):
         data[f'lag_{i}'] = series.shift(i)
+    for i in range(1, horizon):
+        data[f'lead_{i}'] = series.shift(-i)
     df_sup = pd.DataFrame(data)
     return df_sup.dropna()
+
+def lag_matrix(values, lags: int, horizon: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sliding-window (X, y) for the LSTM without building shifted copies.
+
+    For a 1-D series, X is [samples, lags, 1] with X[i, j, 0] = x(t_i-1-j)
+    (lag_1 .. lag_n, most recent first) and y is [samples] = x(t_i), or
+    [samples, horizon] = x(t_i) .. x(t_i+horizon-1). This equals
+    series_to_supervised(series, lags, horizon) split into inputs and
+    targets, for a series without missing values.
+
+    For a 2-D panel [n_series, T] every output gains a leading n_series
+    axis. Both arrays are strided views into `values` (no copy unless the
+    input has to be converted to float64).
+    """
+    values  = np.asarray(values, dtype=np.float64)
+    windows = sliding_window_view(values, lags + horizon, axis=-1)
+    X = windows[..., lags - 1::-1][..., None]
+    y = windows[..., lags] if horizon == 1 else windows[..., lags:]
+    return X, y
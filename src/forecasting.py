@@ -2,71 +2,245 @@
 
 import sys
 import os
+import weakref
 import numpy as np
 import pandas as pd
 
+from src                      import instrumentation
 from src.anomaly_detection    import generate_alerts_report
-from src.data_ingestion       import load_complaints, train_test_split_ts
-from src.feature_engineering  import create_time_features, series_to_supervised
-from src.model_training       import train_arima, train_prophet, train_lstm
+from src.cube                 import TOTAL_SERIES, write_alerts, write_forecasts
+from src.data_ingestion       import count_complaints, train_test_split_ts
+from src.delta_ingestion      import ingest_delta, read_counts
+from src.feature_engineering  import create_time_features, lag_matrix
+from src.model_registry       import ModelRegistry
+from src.model_training       import train_arima, train_prophet, fit_lstm
 from src.utils                import evaluate_forecasts, plot_with_alerts
 
 
-def main(csv_path: str):
-    # 1. Load & prepare series
-    df = load_complaints(csv_path)
-    series = df.resample('M').size()            # Monthly complaint counts
-    train, test = train_test_split_ts(series, test_periods=3)
+# Registry model type and hyperparameters of each forecaster (part of the
+# model-registry cache key, so changing them invalidates cached fits)
+def model_spec(
+    name: str,
+    n_lags: int = 3,
+    direct_horizon: int | None = None,
+    order_cached: bool = False
+) -> tuple[str, dict]:
+    arima = {'seasonal': True, 'm': 12, 'stepwise': True}
+    if order_cached:
+        arima = {'seasonal': True, 'm': 12, 'stepwise': False, 'order_cache': True}
+    return {
+        'ARIMA':   ('arima',   arima),
+        'Prophet': ('prophet', {'yearly_seasonality': True}),
+        'LSTM':    ('lstm',    {'n_lags': n_lags, 'epochs': 50, 'batch_size': 32,
+                                'direct_horizon': direct_horizon}),
+    }[name]
 
-    # 2. ARIMA/SARIMA forecast
-    arima_model = train_arima(train.values)
-    arima_pred  = arima_model.predict(n_periods=len(test))
 
-    # 3. Prophet forecast (with fallback on error)
-    prophet_df = (
-        train
-        .reset_index()
-        .rename(columns={'date_received':'ds', 0:'y'})
-    )
+def _fit(registry, name: str, train: pd.Series, fit, **spec_kwargs):
+    """
+    Call `fit()`, or load the model from `registry` if this exact fit
+    (model, hyperparameters, training data) has been cached before.
+    """
+    if registry is None:
+        return fit()
+    model_type, params = model_spec(name, **spec_kwargs)
+    return registry.get_or_fit(model_type, train, fit, params)
+
+
+def forecast_arima(
+    train: pd.Series,
+    horizon: int,
+    registry=None,
+    order_cache=None
+) -> np.ndarray:
+    """
+    Fit auto-ARIMA on `train` and forecast `horizon` periods ahead.
+    With an ArimaOrderCache, the order selected for this series (keyed by
+    `train.name`, which must be set) is reused and only the coefficients
+    are refitted.
+    """
+    if order_cache is not None and train.name is None:
+        raise ValueError("forecast_arima with an order_cache needs a named series (train.name)")
+    with instrumentation.stage('forecast.ARIMA', series=train.name, rows=len(train)):
+        if order_cache is None:
+            arima_model = _fit(registry, 'ARIMA', train, lambda: train_arima(train.values))
+        else:
+            arima_model = _fit(registry, 'ARIMA', train,
+                               lambda: order_cache.fit(train.name, train.values),
+                               order_cached=True)
+        return np.asarray(arima_model.predict(n_periods=horizon))
+
+
+def forecast_prophet(train: pd.Series, horizon: int, registry=None) -> np.ndarray:
+    """
+    Fit Prophet on `train` and forecast `horizon` periods ahead.
+    Falls back to NaN predictions if Prophet fails.
+    """
+    prophet_df = pd.DataFrame({'ds': train.index, 'y': train.values})
     try:
-        m_prophet    = train_prophet(prophet_df)
-        future       = m_prophet.make_future_dataframe(periods=len(test), freq='M')
+        with instrumentation.stage('forecast.Prophet', series=train.name, rows=len(train)):
+            m_prophet = _fit(registry, 'Prophet', train, lambda: train_prophet(prophet_df))
+        future       = m_prophet.make_future_dataframe(
+            periods=horizon, freq=train.index.freqstr or 'M'
+        )
         forecast     = m_prophet.predict(future)
-        prophet_pred = forecast['yhat'].iloc[-len(test):].values
+        prophet_pred = forecast['yhat'].iloc[-horizon:].values
     except Exception as e:
         print(f"Prophet failed: {e}")
-        prophet_pred = np.full(len(test), np.nan)
-
-    # 4. LSTM forecast
-    n_lags     = 3
-    sup        = series_to_supervised(train, lags=n_lags)
-    lstm_model = train_lstm(sup.values, n_lags)
-    last_obs   = train.values[-n_lags:]
-    lstm_preds = []
-    for _ in range(len(test)):
-        X    = last_obs.reshape(1, n_lags, 1)
-        yhat = lstm_model.predict(X, verbose=0)[0, 0]
-        lstm_preds.append(yhat)
-        last_obs = np.roll(last_obs, -1)
-        last_obs[-1] = yhat
-    lstm_pred = np.array(lstm_preds)
+        prophet_pred = np.full(horizon, np.nan)
+    return prophet_pred
 
-    # 5. Evaluate
-    y_true = test.values
+
+def forecast_lstm(
+    train: pd.Series,
+    horizon: int,
+    n_lags: int = 3,
+    registry=None,
+    direct: bool = False
+) -> np.ndarray:
+    """
+    Fit an LSTM on `n_lags` lagged values of `train` and forecast
+    `horizon` periods ahead, recursively with a one-step model or, with
+    `direct=True`, in one forward pass of a multi-output model.
+    """
+    with instrumentation.stage('forecast.LSTM', series=train.name, rows=len(train)):
+        X, y = lag_matrix(train.values, n_lags, horizon=horizon if direct else 1)
+        fit  = lambda: fit_lstm(X, y)
+        lstm_model = _fit(registry, 'LSTM', train, fit, n_lags=n_lags,
+                          direct_horizon=horizon if direct else None)
+        if direct:
+            return lstm_direct_forecast(lstm_model, train.values, n_lags)
+        return lstm_recursive_forecast(lstm_model, train.values, n_lags, horizon)
+
+
+def _lstm_windows(history: np.ndarray, n_lags: int) -> np.ndarray:
+    """
+    Last `n_lags` values of each series as [n_series, n_lags, 1] float32,
+    most recent first -- the lag_1 .. lag_n column order the LSTM is
+    trained on by `series_to_supervised`.
+    """
+    history = np.atleast_2d(np.asarray(history, dtype=np.float32))
+    return np.ascontiguousarray(history[:, :-n_lags - 1:-1])[..., None]
+
+
+# Compiled forward pass / multi-step rollout per model, traced once and
+# reused across calls
+_FORWARDS = weakref.WeakKeyDictionary()
+_ROLLOUTS = weakref.WeakKeyDictionary()
+
+
+def _compiled_forward(lstm_model):
+    forward = _FORWARDS.get(lstm_model)
+    if forward is None:
+        import tensorflow as tf
+        model_ref = weakref.ref(lstm_model)
+        forward   = tf.function(lambda windows: model_ref()(windows, training=False),
+                                reduce_retracing=True)
+        _FORWARDS[lstm_model] = forward
+    return forward
+
+
+def _compiled_rollout(lstm_model):
+    rollout = _ROLLOUTS.get(lstm_model)
+    if rollout is None:
+        import tensorflow as tf
+        model_ref = weakref.ref(lstm_model)    # don't keep the model alive via the cache
+
+        @tf.function(reduce_retracing=True)
+        def rollout(windows, horizon):
+            model = model_ref()
+            preds = tf.TensorArray(tf.float32, size=horizon)
+            for i in tf.range(horizon):
+                yhat    = model(windows, training=False)[:, :1]
+                preds   = preds.write(i, yhat[:, 0])
+                # newest prediction becomes lag_1, the oldest lag drops off
+                windows = tf.concat([yhat[:, :, None], windows[:, :-1, :]], axis=1)
+            return tf.transpose(preds.stack())
+
+        _ROLLOUTS[lstm_model] = rollout
+    return rollout
+
+
+def lstm_recursive_forecast(
+    lstm_model,
+    history: np.ndarray,
+    n_lags: int,
+    horizon: int
+) -> np.ndarray:
+    """
+    Roll a one-step LSTM forward `horizon` steps from the end of `history`,
+    feeding each prediction back in as the newest lag.
+
+    `history` is one series (1-D) or a panel [n_series, T] sharing the
+    model; all series advance together as one batch, and the whole rollout
+    runs as a single compiled graph call instead of one `predict` per step.
+    Returns [horizon] or [n_series, horizon] accordingly.
+    """
+    windows = _lstm_windows(history, n_lags)
+    preds   = _compiled_rollout(lstm_model)(windows, np.int32(horizon)).numpy()
+    return preds[0] if np.ndim(history) == 1 else preds
+
+
+def lstm_direct_forecast(lstm_model, history: np.ndarray, n_lags: int) -> np.ndarray:
+    """
+    Whole-horizon forecast from a direct multi-output LSTM (see
+    `forecast_lstm(direct=True)`) in one forward pass over all series.
+    """
+    preds = _compiled_forward(lstm_model)(_lstm_windows(history, n_lags)).numpy()
+    return preds[0] if np.ndim(history) == 1 else preds
+
+
+# Model name -> forecaster(train, horizon) used by main() and batch entry points
+FORECASTERS = {
+    'ARIMA':   forecast_arima,
+    'Prophet': forecast_prophet,
+    'LSTM':    forecast_lstm,
+}
+
+
+def main(
+    csv_path: str,
+    store_dir: str | None = None,
+    registry_dir: str | None = None,
+    cube_dir: str | None = None
+):
+    # 1. Load & prepare series (monthly complaint counts). With an aggregate
+    #    store, only rows added since the last run are parsed.
+    with instrumentation.stage('load') as rec:
+        if store_dir is not None:
+            ingest_delta(csv_path, store_dir)
+            series = read_counts(store_dir, freq='M')
+        else:
+            series = count_complaints(csv_path, freq='M')
+        rec['rows'] = int(series.sum())    # complaints counted
+    train, test = train_test_split_ts(series, test_periods=3)
+
+    # 2-4. ARIMA/SARIMA, Prophet (with fallback on error) and LSTM forecasts;
+    #      fits of an unchanged training series are loaded from the registry
+    registry = ModelRegistry(registry_dir) if registry_dir else None
     y_preds = {
-        'ARIMA':   arima_pred,
-        'Prophet': prophet_pred,
-        'LSTM':    lstm_pred
+        name: forecaster(train, len(test), registry=registry)
+        for name, forecaster in FORECASTERS.items()
     }
+
+    # 5. Evaluate
+    y_true = test.values
     # drop any with NaNs
     valid_preds = {n: p for n, p in y_preds.items() if not np.isnan(p).any()}
     skipped     = [n for n in y_preds if n not in valid_preds]
     if skipped:
         print(f"Skipping models due to NaN predictions: {skipped}")
 
-    results = evaluate_forecasts(y_true, valid_preds)
+    with instrumentation.stage('evaluate', rows=len(y_true)):
+        results = evaluate_forecasts(y_true, valid_preds)
     print("\nModel comparison:")
     print(results)
+    if registry is not None:
+        for name, metrics in results.iterrows():
+            model_type, params = model_spec(name)
+            registry.record_metrics(
+                registry.make_key(model_type, train, params), metrics.to_dict()
+            )
 
     # 6. Anomaly & change-point detection
     alerts = generate_alerts_report(
@@ -84,6 +258,17 @@ def main(csv_path: str):
     alerts.to_csv('reports/alerts_report.csv', index=False)
     print("Alerts report saved to reports/alerts_report.csv\n")
 
+    # Publish forecasts and alerts to the dashboard cube (see src.cube)
+    if cube_dir is not None:
+        with instrumentation.stage('publish'):
+            write_forecasts(cube_dir, pd.DataFrame([
+                {'series': TOTAL_SERIES, 'date': date, 'model': name,
+                 'actual': actual, 'forecast': yhat}
+                for name, pred in y_preds.items()
+                for date, actual, yhat in zip(test.index, test.values, pred)
+            ]))
+            write_alerts(cube_dir, alerts.assign(series=TOTAL_SERIES))
+
     # return everything needed upstream
     return series, results, alerts
 
@@ -92,9 +277,13 @@ if __name__ == "__main__":
     path = sys.argv[1] if len(sys.argv) > 1 else (
         "C://Users//ssbap//US-Consumer-Complaints-Forecasting//data//processed//cleaned_consumer_complaints.csv"
     )
+    store = sys.argv[2] if len(sys.argv) > 2 else None
+    registry_dir = sys.argv[3] if len(sys.argv) > 3 else None
+    cube_dir = sys.argv[4] if len(sys.argv) > 4 else None
 
     # run all models + anomaly detection
-    series, results, alerts = main(path)
+    series, results, alerts = main(path, store_dir=store, registry_dir=registry_dir,
+                                   cube_dir=cube_dir)
 
     # finally, show the series with flagged alerts
     plot_with_alerts(series, alerts)
@@ -0,0 +1,220 @@
+# src/global_model.py
+#
+# One forecasting network trained across all series of a panel (e.g. every
+# product), instead of a separate small LSTM per series. Each series is
+# scaled by its own mean level and identified by a learned embedding, so
+# series of very different volumes share one set of weights. Training
+# windows are cut on the fly by a tf.data pipeline that gathers
+# (series, position) index pairs from the scaled panel; the supervised
+# matrix is never materialised. Serving forecasts every series in a single
+# batched forward pass (direct multi-horizon output, no recursion).
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src import instrumentation
+
+ARCHITECTURES = ('lstm', 'transformer')
+
+
+def _build_network(n_series: int, n_lags: int, horizon: int, units: int,
+                   embedding_dim: int, architecture: str):
+    import tensorflow as tf
+    from tensorflow.keras import layers
+
+    window = layers.Input(shape=(n_lags, 1), name='window')
+    sid    = layers.Input(shape=(), dtype='int32', name='series')
+    emb    = layers.Embedding(n_series, embedding_dim, name='series_embedding')(sid)
+    # the series embedding is fed to every time step next to the lag value
+    emb_t  = layers.RepeatVector(n_lags)(emb)
+    x      = layers.Concatenate()([window, emb_t])
+
+    if architecture == 'lstm':
+        x = layers.LSTM(units)(x)
+    elif architecture == 'transformer':
+        x   = layers.Dense(units)(x)
+        pos = layers.Embedding(n_lags, units)(tf.range(n_lags))
+        x   = x + pos
+        att = layers.MultiHeadAttention(num_heads=4, key_dim=max(units // 4, 1))(x, x)
+        x   = layers.LayerNormalization()(x + att)
+        ff  = layers.Dense(units, activation='relu')(x)
+        x   = layers.LayerNormalization()(x + layers.Dense(units)(ff))
+        x   = layers.GlobalAveragePooling1D()(x)
+    else:
+        raise ValueError(f"Unknown architecture {architecture!r}; use one of {ARCHITECTURES}")
+    x   = layers.Concatenate()([x, emb])
+    out = layers.Dense(horizon, name='forecast')(x)
+
+    model = tf.keras.Model([window, sid], out)
+    model.compile(optimizer='adam', loss='mae')
+    return model
+
+
+class GlobalForecaster:
+    """
+    Direct multi-horizon LSTM (or small Transformer) shared by all series.
+
+    Args:
+        n_lags: input window length.
+        horizon: periods forecast per call.
+        units: LSTM units / Transformer width.
+        embedding_dim: size of the learned per-series embedding.
+        architecture: 'lstm' or 'transformer'.
+    """
+
+    def __init__(
+        self,
+        n_lags: int = 12,
+        horizon: int = 3,
+        units: int = 64,
+        embedding_dim: int = 4,
+        architecture: str = 'lstm'
+    ):
+        if architecture not in ARCHITECTURES:
+            raise ValueError(f"Unknown architecture {architecture!r}; use one of {ARCHITECTURES}")
+        self.n_lags        = n_lags
+        self.horizon       = horizon
+        self.units         = units
+        self.embedding_dim = embedding_dim
+        self.architecture  = architecture
+        self.model         = None
+        self.series        = None
+        self.scale         = None
+        self.history       = None
+
+    def _scaled(self, counts: pd.DataFrame) -> np.ndarray:
+        return (counts.to_numpy(dtype=np.float32) / self.scale).T     # [n_series, T]
+
+    def _index_pairs(self, panel: np.ndarray, start: np.ndarray, val_periods: int):
+        """
+        (series, target start) pairs of every full window, split into
+        training and validation by where the target window ends.
+        """
+        n_series, T = panel.shape
+        first = self.n_lags
+        last  = T - self.horizon                     # inclusive target start
+        sids, pos = [], []
+        for s in range(n_series):
+            t = np.arange(max(first, start[s] + self.n_lags), last + 1)
+            sids.append(np.full(len(t), s, dtype=np.int32))
+            pos.append(t.astype(np.int32))
+        sids, pos = np.concatenate(sids), np.concatenate(pos)
+        is_val = pos + self.horizon > T - val_periods
+        return (sids[~is_val], pos[~is_val]), (sids[is_val], pos[is_val])
+
+    def _dataset(self, panel, sids, pos, batch_size: int, shuffle: bool):
+        import tensorflow as tf
+
+        panel   = tf.constant(panel)
+        lag_off = tf.range(-1, -self.n_lags - 1, -1)          # most recent first
+        out_off = tf.range(self.horizon)
+
+        def windows(s, t):
+            rows = tf.gather(panel, s)                         # [batch, T]
+            X    = tf.gather(rows, t[:, None] + lag_off, batch_dims=1)
+            y    = tf.gather(rows, t[:, None] + out_off, batch_dims=1)
+            return (X[..., None], s), y
+
+        ds = tf.data.Dataset.from_tensor_slices((sids, pos))
+        if shuffle:
+            ds = ds.shuffle(len(sids), reshuffle_each_iteration=True)
+        return (ds.batch(batch_size)
+                  .map(windows, num_parallel_calls=tf.data.AUTOTUNE)
+                  .prefetch(tf.data.AUTOTUNE))
+
+    def fit(
+        self,
+        counts: pd.DataFrame,
+        epochs: int = 200,
+        batch_size: int = 256,
+        val_periods: int | None = None,
+        patience: int = 10,
+        verbose: int = 0
+    ) -> 'GlobalForecaster':
+        """
+        Train on a wide period x series count frame (e.g. from
+        `resample_counts(df, by='product')`). Leading zeros of a series
+        (before it existed) are skipped. The windows whose targets fall in
+        the last `val_periods` periods (default: `horizon`) are held out
+        for early stopping, and the best weights are restored.
+        """
+        import tensorflow as tf
+
+        self.series = list(counts.columns)
+        values      = counts.to_numpy(dtype=np.float32)
+        nonzero     = values != 0
+        start       = np.where(nonzero.any(axis=0), nonzero.argmax(axis=0), len(values))
+        # per-series scale: mean level over the observed part of the series
+        self.scale  = np.array([
+            values[s:, i].mean() if s < len(values) else 1.0 for i, s in enumerate(start)
+        ], dtype=np.float32)
+        self.scale[self.scale <= 0] = 1.0
+        panel       = self._scaled(counts)
+
+        val_periods = self.horizon if val_periods is None else val_periods
+        (tr_s, tr_t), (va_s, va_t) = self._index_pairs(panel, start, val_periods)
+        if len(tr_s) == 0:
+            raise ValueError(
+                f"Series too short for n_lags={self.n_lags}, horizon={self.horizon}"
+            )
+
+        self.model = _build_network(len(self.series), self.n_lags, self.horizon,
+                                    self.units, self.embedding_dim, self.architecture)
+        train_ds   = self._dataset(panel, tr_s, tr_t, batch_size, shuffle=True)
+        val_ds     = self._dataset(panel, va_s, va_t, batch_size, shuffle=False) if len(va_s) else None
+        monitor    = 'val_loss' if val_ds is not None else 'loss'
+        stop       = tf.keras.callbacks.EarlyStopping(monitor=monitor, patience=patience,
+                                                      restore_best_weights=True)
+        with instrumentation.stage('global.fit', rows=len(tr_s), n_series=len(self.series)):
+            self.history = self.model.fit(train_ds, validation_data=val_ds, epochs=epochs,
+                                          callbacks=[stop], verbose=verbose)
+        return self
+
+    def predict(self, counts: pd.DataFrame) -> pd.DataFrame:
+        """
+        Forecast the `horizon` periods after the end of `counts` (same
+        series as in `fit`) for every series in one forward pass. Returns
+        a horizon x series frame indexed by the forecast dates.
+        """
+        counts  = counts[self.series]
+        panel   = self._scaled(counts)
+        windows = np.ascontiguousarray(panel[:, :-self.n_lags - 1:-1])[..., None]
+        sids    = np.arange(len(self.series), dtype=np.int32)
+        with instrumentation.stage('global.predict', rows=len(sids)):
+            preds = self.model((windows, sids), training=False).numpy() * self.scale[:, None]
+        freq  = counts.index.freqstr or pd.infer_freq(counts.index) or 'M'
+        dates = pd.date_range(counts.index[-1], periods=self.horizon + 1, freq=freq)[1:]
+        return pd.DataFrame(preds.T, index=dates, columns=self.series)
+
+
+def forecast_global(
+    counts: pd.DataFrame,
+    test_periods: int = 3,
+    model_name: str = 'Global LSTM',
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Hold out the last `test_periods` of every column, train one
+    GlobalForecaster on the rest and forecast all series at once.
+    `kwargs` go to GlobalForecaster (n_lags, units, architecture, ...).
+
+    Returns a frame in the `forecast_panel` layout (FORECAST_COLUMNS);
+    `fit_seconds` is the shared training time.
+    """
+    from src.batch_forecasting import FORECAST_COLUMNS
+
+    train, test = counts.iloc[:-test_periods], counts.iloc[-test_periods:]
+    t0    = time.perf_counter()
+    model = GlobalForecaster(horizon=test_periods, **kwargs).fit(train)
+    preds = model.predict(train)
+    seconds = time.perf_counter() - t0
+
+    records = [
+        {'series': key, 'date': date, 'model': model_name, 'actual': actual,
+         'forecast': yhat, 'fit_seconds': seconds}
+        for key in counts.columns
+        for date, actual, yhat in zip(test.index, test[key].values, preds[key].values)
+    ]
+    return pd.DataFrame(records, columns=FORECAST_COLUMNS)
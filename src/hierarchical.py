@@ -0,0 +1,235 @@
+# src/hierarchical.py
+#
+# Coherent forecasts for a hierarchy of complaint counts, e.g.
+# total -> product -> product/state. The bottom (leaf) series are counted
+# in one pass over the complaint frame; every aggregate is S @ leaves with a
+# sparse summing matrix S (n_nodes x n_leaves), so the tree is never
+# re-aggregated per level. Base forecasts are fitted on the process pool
+# (only the leaves for bottom-up) and reconciled as
+#
+#     y_tilde = S G y_hat,   G = (S' W^-1 S)^-1 S' W^-1
+#
+# with W = I (OLS), W = diag(S 1) (structural WLS) or a shrunk covariance of
+# base forecast errors (MinT). See Wickramasuriya, Athanasopoulos & Hyndman
+# (2019), "Optimal forecast reconciliation for hierarchical and grouped
+# time series through trace minimization".
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.batch_forecasting import forecast_panel
+from src.data_ingestion    import fill_missing_keys, resample_counts
+
+TOTAL      = 'Total'
+SEPARATOR  = ' / '
+HIERARCHY_COLUMNS = ['series', 'level', 'date', 'model', 'actual', 'base', 'forecast']
+METHODS    = ('bottom_up', 'ols', 'wls_struct', 'mint_shrink')
+
+
+class Hierarchy:
+    """
+    Aggregation tree over leaf series.
+
+    Attributes:
+        levels: grouping columns, top to bottom (e.g. ['product', 'state']).
+        nodes: node names, top-down: 'Total', then one per level, leaves last
+            (a node is its path joined with ' / ', e.g. 'Mortgage / CA').
+        node_levels: depth name of each node ('total' or a level column).
+        S: sparse summing matrix, S[i, j] = 1 if leaf j rolls up into node i.
+    """
+
+    def __init__(self, leaves: pd.MultiIndex | pd.Index, levels: list[str]):
+        self.levels = list(levels)
+        paths = [tuple(map(str, p)) for p in (leaves if isinstance(leaves, pd.MultiIndex)
+                                               else ((k,) for k in leaves))]
+        n_leaves = len(paths)
+
+        nodes, node_levels = [TOTAL], ['total']
+        rows, cols         = [np.zeros(n_leaves, int)], [np.arange(n_leaves)]
+        for depth, level in enumerate(self.levels, start=1):
+            codes, uniques = pd.factorize(np.array([SEPARATOR.join(p[:depth]) for p in paths], dtype=object))
+            rows.append(codes + len(nodes))
+            cols.append(np.arange(n_leaves))
+            nodes.extend(uniques)
+            node_levels.extend([level] * len(uniques))
+
+        self.nodes       = nodes
+        self.node_levels = node_levels
+        self.n_leaves    = n_leaves
+        self.S = sparse.csr_matrix(
+            (np.ones(sum(len(r) for r in rows)), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(nodes), n_leaves),
+        )
+
+    @property
+    def leaves(self) -> list[str]:
+        return self.nodes[-self.n_leaves:]
+
+    def aggregate(self, bottom: pd.DataFrame) -> pd.DataFrame:
+        """
+        Period x node frame of all series from a period x leaf frame.
+        """
+        values = (self.S @ bottom.to_numpy(dtype=float).T).T
+        return pd.DataFrame(values, index=bottom.index, columns=self.nodes)
+
+
+def build_hierarchy(
+    df: pd.DataFrame,
+    levels=('product', 'state'),
+    freq: str = 'M'
+) -> tuple[Hierarchy, pd.DataFrame]:
+    """
+    Count a date-indexed complaints frame per `freq` period for every leaf
+    (one groupby over all `levels`) and derive every aggregate from it.
+    Missing keys are counted under MISSING_KEY ('Unknown').
+
+    Returns:
+        (hierarchy, counts) with `counts` a period x node frame whose
+        columns are `hierarchy.nodes`.
+    """
+    levels = list(levels)
+    # rows with a missing key count towards an 'Unknown' node, so every
+    # aggregate (and the Total) still matches the raw counts
+    df     = fill_missing_keys(df, levels)
+    if len(levels) == 1:
+        bottom = resample_counts(df, freq=freq, by=levels[0])
+    else:
+        counts = df.groupby([pd.Grouper(freq=freq), *levels], observed=True).size()
+        bottom = counts.unstack(levels, fill_value=0).resample(freq).sum().astype('int64')
+    hierarchy = Hierarchy(bottom.columns, levels)
+    return hierarchy, hierarchy.aggregate(bottom)
+
+
+def _shrink_covariance(residuals: np.ndarray) -> np.ndarray:
+    """
+    Schäfer-Strimmer shrinkage of the (n_obs x n_series) residual
+    covariance towards its diagonal, as used for MinT.
+    """
+    n   = len(residuals)
+    cov = residuals.T @ residuals / n
+    x   = (residuals - residuals.mean(axis=0)) / residuals.std(axis=0, ddof=1).clip(min=1e-12)
+    corr = x.T @ x / n
+    v    = (1 / (n * (n - 1))) * ((x ** 2).T @ (x ** 2) - corr ** 2 * n)
+    np.fill_diagonal(v, 0)
+    off  = corr ** 2
+    np.fill_diagonal(off, 0)
+    lam  = float(np.clip(v.sum() / off.sum(), 0, 1)) if off.sum() > 0 else 1.0
+    return lam * np.diag(np.diag(cov)) + (1 - lam) * cov
+
+
+def reconciliation_matrix(
+    S: sparse.spmatrix,
+    method: str = 'wls_struct',
+    residuals: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    The n_leaves x n_nodes matrix G mapping base forecasts of every node to
+    reconciled leaf forecasts (reconciled nodes are S @ G @ y_hat).
+
+    Args:
+        S: summing matrix of the hierarchy.
+        method: 'bottom_up', 'ols', 'wls_struct' or 'mint_shrink'.
+        residuals: (n_obs x n_nodes) base forecast errors, for 'mint_shrink'.
+    """
+    n_nodes, n_leaves = S.shape
+    if method == 'bottom_up':
+        return np.hstack([np.zeros((n_leaves, n_nodes - n_leaves)), np.eye(n_leaves)])
+    if method == 'ols':
+        w_inv = sparse.identity(n_nodes, format='csr')
+    elif method == 'wls_struct':
+        w_inv = sparse.diags(1.0 / np.asarray(S.sum(axis=1)).ravel())
+    elif method == 'mint_shrink':
+        if residuals is None:
+            raise ValueError("method='mint_shrink' needs base forecast residuals")
+        w     = _shrink_covariance(np.asarray(residuals, dtype=float))
+        w_inv = np.linalg.pinv(w)
+    else:
+        raise ValueError(f"Unknown method {method!r}; use one of {METHODS}")
+    St_Winv = np.asarray((S.T @ w_inv).todense() if sparse.issparse(w_inv) else S.T @ w_inv)
+    return np.linalg.solve(St_Winv @ S, St_Winv)
+
+
+def reconcile(
+    base: pd.DataFrame,
+    hierarchy: Hierarchy,
+    method: str = 'wls_struct',
+    residuals: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """
+    Reconcile a horizon x node frame of base forecasts (columns in
+    `hierarchy.nodes` order; only leaves are used for 'bottom_up').
+    Returns a coherent horizon x node frame.
+    """
+    base = base[hierarchy.nodes]
+    if method == 'bottom_up':
+        return hierarchy.aggregate(base[hierarchy.leaves])
+    if residuals is not None:
+        residuals = residuals[hierarchy.nodes].to_numpy(dtype=float)
+    G = reconciliation_matrix(hierarchy.S, method, residuals)
+    values = hierarchy.S @ (G @ base.to_numpy(dtype=float).T)
+    return pd.DataFrame(np.asarray(values).T, index=base.index, columns=hierarchy.nodes)
+
+
+def hierarchical_forecast(
+    df: pd.DataFrame,
+    levels=('product', 'state'),
+    freq: str = 'M',
+    test_periods: int = 3,
+    models=('ARIMA', 'Prophet', 'LSTM'),
+    method: str = 'wls_struct',
+    residuals: pd.DataFrame | None = None,
+    **pool_kwargs
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Forecast the last `test_periods` of every node of the hierarchy and
+    reconcile them so that every level adds up.
+
+    Args:
+        df: date-indexed complaints frame (from `load_complaints`).
+        levels: grouping columns, top to bottom.
+        freq, test_periods, models: as in `forecast_panel`.
+        method: reconciliation method (see METHODS). 'bottom_up' fits only
+            the leaves; the others fit every node once.
+        residuals: period x node base forecast errors for 'mint_shrink',
+            e.g. from `walk_forward_backtest` runs.
+        pool_kwargs: max_workers, threads_per_worker, registry_dir.
+
+    Returns:
+        (forecasts, summary). `forecasts` has HIERARCHY_COLUMNS with the base
+        and reconciled forecast per node, date and model; `summary` is the
+        per-series summary of `forecast_panel`.
+    """
+    hierarchy, counts = build_hierarchy(df, levels, freq)
+    fit_nodes = hierarchy.leaves if method == 'bottom_up' else hierarchy.nodes
+    panel, summary = forecast_panel(
+        counts[fit_nodes], test_periods=test_periods, models=models, **pool_kwargs
+    )
+
+    test   = counts.iloc[-test_periods:]
+    last   = counts.iloc[-test_periods - 1]
+    frames = []
+    for name, g in panel.groupby('model', sort=False):
+        base   = g.pivot(index='date', columns='series', values='forecast').reindex(
+            index=test.index, columns=hierarchy.nodes
+        )
+        failed = [n for n in fit_nodes if base[n].isna().any()]
+        if failed:
+            print(f"{name}: no base forecast for {len(failed)} series, using last value")
+            base[failed] = base[failed].fillna(last[failed])
+        tilde = reconcile(base, hierarchy, method, residuals)
+        frames.append(pd.DataFrame({
+            'series':   np.tile(hierarchy.nodes, len(test)),
+            'level':    np.tile(hierarchy.node_levels, len(test)),
+            'date':     np.repeat(test.index, len(hierarchy.nodes)),
+            'model':    name,
+            'actual':   test.to_numpy(dtype=float).ravel(),
+            'base':     base.to_numpy(dtype=float).ravel(),
+            'forecast': tilde.to_numpy(dtype=float).ravel(),
+        }))
+
+    forecasts = (
+        pd.concat(frames, ignore_index=True) if frames
+        else pd.DataFrame(columns=HIERARCHY_COLUMNS)
+    )
+    return forecasts, summary
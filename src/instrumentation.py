@@ -0,0 +1,309 @@
+# src/instrumentation.py
+#
+# Per-stage timing and memory records for the pipeline. Code marks stages
+#
+#     with instrumentation.stage('forecast.ARIMA', series=key, rows=len(train)):
+#         ...
+#
+# and, once `enable()` has been called, each stage records wall and CPU
+# seconds, the process peak RSS (and how much the stage raised it), a row
+# count and free-form tags. Disabled (the default), `stage` returns a shared
+# no-op context manager, so the hooks cost one function call.
+#
+# Records stay in the process that made them; pool workers started by
+# `src.batch_forecasting.forecast_pool` inherit the configuration and send
+# their records back with each task's result (see `call_collecting`).
+# Exporters: pandas frame, JSON, Prometheus textfile, structured log lines.
+# One stage can also be captured with cProfile or tracemalloc.
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import nullcontext
+
+import pandas as pd
+
+RECORD_COLUMNS = ['stage', 'series', 'wall_seconds', 'cpu_seconds', 'peak_rss_mb',
+                  'rss_growth_mb', 'rows', 'pid', 'started', 'tags']
+PROFILE_MODES  = ('cprofile', 'tracemalloc')
+
+logger = logging.getLogger('complaints.instrumentation')
+
+_NOOP     = nullcontext({})   # yields a throwaway dict, so `rec['rows'] = n` still works
+_config   = None      # dict while enabled
+_records  = []
+
+
+def _peak_rss_mb() -> float | None:
+    """
+    Process peak RSS in MB. `resource` is Unix-only; elsewhere fall back to
+    psutil's peak working set (Windows) or current RSS, or None without it.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        mem = psutil.Process().memory_info()
+        return getattr(mem, 'peak_wset', mem.rss) / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10   # bytes vs KiB
+
+
+def enable(
+    log: bool = False,
+    profile_stage: str | None = None,
+    profile_mode: str = 'cprofile',
+    profile_dir: str = 'profiles'
+) -> None:
+    """
+    Start recording stages (clears earlier records).
+
+    Args:
+        log: also emit every record as a JSON log line on the
+            'complaints.instrumentation' logger as the stage ends.
+        profile_stage: name of one stage to capture in detail, e.g.
+            'forecast.ARIMA' (every run of it, in every process).
+        profile_mode: 'cprofile' (writes <stage>-<series>-<pid>.prof, readable
+            with pstats/snakeviz) or 'tracemalloc' (writes the top allocation
+            sites as .txt and records 'traced_peak_mb').
+        profile_dir: where profile files are written.
+    """
+    global _config
+    if profile_mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile_mode {profile_mode!r}; use one of {PROFILE_MODES}")
+    _config = {'log': log, 'profile_stage': profile_stage,
+               'profile_mode': profile_mode, 'profile_dir': profile_dir}
+    _records.clear()
+
+
+def disable() -> None:
+    global _config
+    _config = None
+
+
+def is_enabled() -> bool:
+    return _config is not None
+
+
+def config() -> dict | None:
+    """
+    Current configuration, to re-create it in another process with
+    `enable(**config)` (None when disabled).
+    """
+    return dict(_config) if _config is not None else None
+
+
+class _Stage:
+    __slots__ = ('record', '_wall', '_cpu', '_rss', '_profiler')
+
+    def __init__(self, name: str, series, rows, tags: dict):
+        self.record = {'stage': name, 'series': series, 'rows': rows, 'tags': tags}
+        self._profiler = None
+
+    def __enter__(self):
+        if _config['profile_stage'] == self.record['stage']:
+            self._start_profile()
+        self._rss  = _peak_rss_mb()
+        self._cpu  = time.process_time()
+        self._wall = time.perf_counter()
+        self.record['started'] = time.time()
+        return self.record
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._wall
+        cpu  = time.process_time() - self._cpu
+        rss  = _peak_rss_mb()
+        if self._profiler is not None:
+            self._stop_profile()
+        self.record.update({
+            'wall_seconds': wall, 'cpu_seconds': cpu, 'peak_rss_mb': rss,
+            'rss_growth_mb': rss - self._rss if rss is not None else None,
+            'pid': os.getpid(),
+        })
+        if exc[0] is not None:
+            self.record['tags'] = {**self.record['tags'], 'error': exc[0].__name__}
+        _records.append(self.record)
+        if _config['log']:
+            logger.info(json.dumps(self.record, default=str))
+        return False
+
+    def _profile_path(self, ext: str) -> str:
+        os.makedirs(_config['profile_dir'], exist_ok=True)
+        label = re.sub(r'[^\w.-]+', '_', f"{self.record['stage']}-{self.record['series']}")
+        return os.path.join(_config['profile_dir'], f'{label}-{os.getpid()}.{ext}')
+
+    def _start_profile(self):
+        if _config['profile_mode'] == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            import tracemalloc
+            tracemalloc.start(25)
+            self._profiler = tracemalloc
+
+    def _stop_profile(self):
+        if _config['profile_mode'] == 'cprofile':
+            self._profiler.disable()
+            path = self._profile_path('prof')
+            self._profiler.dump_stats(path)
+        else:
+            tracemalloc = self._profiler
+            snapshot = tracemalloc.take_snapshot()
+            self.record['tags'] = {**self.record['tags'],
+                                   'traced_peak_mb': tracemalloc.get_traced_memory()[1] / 2**20}
+            tracemalloc.stop()
+            path = self._profile_path('txt')
+            with open(path, 'w') as f:
+                for stat in snapshot.statistics('traceback')[:25]:
+                    f.write(f"{stat}\n" + "\n".join(stat.traceback.format()) + "\n\n")
+        self.record['tags'] = {**self.record['tags'], 'profile': path}
+
+
+def stage(name: str, series=None, rows: int | None = None, **tags):
+    """
+    Context manager timing one stage. The `with` target is the record
+    dict, so `rows` can be filled in once known: `rec['rows'] = len(df)`.
+    """
+    if _config is None:
+        return _NOOP
+    return _Stage(name, series, rows, tags)
+
+
+def init_worker(instrument: dict | None) -> None:
+    """
+    Pool initializer: `enable(**instrument)` in the worker when the parent
+    passed its `config()`.
+    """
+    if instrument is not None:
+        enable(**instrument)
+
+
+def records() -> list[dict]:
+    return list(_records)
+
+
+def drain() -> list[dict]:
+    """
+    Return and clear this process's records.
+    """
+    out = list(_records)
+    _records.clear()
+    return out
+
+
+def merge(recs: list[dict]) -> None:
+    """
+    Add records made in another process (e.g. a pool worker).
+    """
+    if _config is not None:
+        _records.extend(recs)
+
+
+def call_collecting(fn, *args, **kwargs):
+    """
+    Run `fn` in a worker and return (result, records it produced), for
+    the parent to `merge`.
+    """
+    drain()
+    return fn(*args, **kwargs), drain()
+
+
+def submit(pool, fn, *args, **kwargs):
+    """
+    `pool.submit(fn, ...)`, collecting the worker's records when enabled;
+    pair with `result`.
+    """
+    if _config is None:
+        return pool.submit(fn, *args, **kwargs)
+    return pool.submit(call_collecting, fn, *args, **kwargs)
+
+
+def result(future):
+    """
+    Result of a future from `submit`, merging the worker's records.
+    """
+    value = future.result()
+    if _config is None:
+        return value
+    value, recs = value
+    merge(recs)
+    return value
+
+
+def to_frame(recs: list[dict] | None = None) -> pd.DataFrame:
+    recs = records() if recs is None else recs
+    return pd.DataFrame(recs, columns=RECORD_COLUMNS)
+
+
+def summary(recs: list[dict] | None = None) -> pd.DataFrame:
+    """
+    Totals per stage: count, wall/CPU seconds, max peak RSS, rows.
+    """
+    df = to_frame(recs)
+    return (
+        df.groupby('stage', sort=False)
+        .agg(count=('stage', 'size'), wall_seconds=('wall_seconds', 'sum'),
+             cpu_seconds=('cpu_seconds', 'sum'), peak_rss_mb=('peak_rss_mb', 'max'),
+             rows=('rows', 'sum'))
+        .sort_values('wall_seconds', ascending=False)
+    )
+
+
+def export_json(path: str, recs: list[dict] | None = None) -> None:
+    recs = records() if recs is None else recs
+    with open(path, 'w') as f:
+        json.dump(recs, f, indent=2, default=str)
+
+
+def _label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def export_prometheus(path: str, recs: list[dict] | None = None, prefix: str = 'complaints_stage') -> None:
+    """
+    Write a node_exporter textfile-collector file: per (stage, series),
+    summed wall/CPU seconds and rows, run count and max peak RSS. Written
+    atomically so the collector never reads a partial file.
+    """
+    df = to_frame(recs)
+    df['series'] = df['series'].fillna('').astype(str)
+    agg = df.groupby(['stage', 'series'], sort=False).agg(
+        wall_seconds=('wall_seconds', 'sum'), cpu_seconds=('cpu_seconds', 'sum'),
+        peak_rss_bytes=('peak_rss_mb', 'max'), rows=('rows', 'sum'), runs=('stage', 'size'),
+    )
+    agg['peak_rss_bytes'] *= 2**20
+    metrics = {
+        'wall_seconds':   'Wall-clock seconds spent in the stage',
+        'cpu_seconds':    'CPU seconds spent in the stage',
+        'peak_rss_bytes': 'Process peak resident set size at the end of the stage',
+        'rows':           'Rows processed by the stage',
+        'runs':           'Number of times the stage ran',
+    }
+    lines = []
+    for metric, help_text in metrics.items():
+        name = f'{prefix}_{metric}'
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+        for (stage_name, series), value in agg[metric].items():
+            labels = f'stage="{_label(stage_name)}",series="{_label(series)}"'
+            lines.append(f'{name}{{{labels}}} {float(value):g}')
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp, path)
+
+
+def export(path: str, recs: list[dict] | None = None) -> None:
+    """
+    Export by extension: '.prom' -> Prometheus textfile, otherwise JSON.
+    """
+    if path.endswith('.prom'):
+        export_prometheus(path, recs)
+    else:
+        export_json(path, recs)
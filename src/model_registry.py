@@ -0,0 +1,230 @@
+# src/model_registry.py
+#
+# On-disk cache of fitted models keyed by a content hash of
+# (model type, hyperparameters, training data), so unchanged series are
+# never refit. Each entry is a directory <root>/<key>/ holding the
+# serialized model and a meta.json with fit time, data range and metrics.
+# Least-recently-used entries are evicted past `max_entries` / `max_bytes`
+# (bounded by default). Pool workers share a registry: an entry evicted
+# while being read is a cache miss, and a concurrent put of the same key
+# (same content hash) is a hit.
+
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+META_FILE           = 'meta.json'
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES   = 2 * 2**30
+
+
+def _dir_bytes(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(d, f))
+        for d, _, files in os.walk(path) for f in files
+    )
+
+
+class ModelRegistry:
+    """
+    Content-addressed store of fitted models.
+
+    Args:
+        root: directory holding one sub-directory per cached model.
+        max_entries: keep at most this many models (None: unlimited).
+        max_bytes: keep the registry below this size on disk (None: unlimited).
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = DEFAULT_MAX_BYTES
+    ):
+        self.root        = os.fspath(root)
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_type: str, train_data, params: dict | None = None) -> str:
+        """
+        SHA-256 of the model type, its hyperparameters and the training data
+        (values and, for pandas objects, the index).
+        """
+        h = hashlib.sha256()
+        h.update(model_type.encode())
+        h.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+        if isinstance(train_data, (pd.Series, pd.DataFrame)):
+            h.update(pd.util.hash_pandas_object(train_data, index=True).values.tobytes())
+        else:
+            arr = np.ascontiguousarray(train_data)
+            h.update(str((arr.dtype, arr.shape)).encode())
+            h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def metadata(self, key: str) -> dict | None:
+        path = os.path.join(self._path(key), META_FILE)
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):   # absent, evicted or unreadable
+            return None
+
+    def _write_meta(self, entry_dir: str, meta: dict) -> None:
+        # per-writer tmp name: pool workers hitting the same entry must not
+        # replace (or publish) each other's half-written file
+        tmp = os.path.join(entry_dir, f'{META_FILE}.{os.getpid()}.{uuid.uuid4().hex}.tmp')
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(meta, f, indent=2, default=str)
+            os.replace(tmp, os.path.join(entry_dir, META_FILE))
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+
+    def get(self, key: str):
+        """
+        Load the model stored under `key`, or return None if absent.
+        """
+        meta = self.metadata(key)
+        if meta is None:
+            return None
+        try:
+            model = _load_model(self._path(key), meta['format'])
+        except FileNotFoundError:      # evicted while being read
+            return None
+        meta['last_access'] = time.time()
+        try:
+            self._write_meta(self._path(key), meta)
+        except OSError:                # evicted meanwhile; the model is still valid
+            pass
+        return model
+
+    def put(self, key: str, model, model_type: str, **metadata) -> None:
+        """
+        Store a fitted model with its metadata, then evict down to the limits.
+        """
+        tmp = os.path.join(self.root, f'.tmp-{uuid.uuid4().hex}')
+        os.makedirs(tmp)
+        fmt = _save_model(model, model_type, tmp)
+        now = time.time()
+        self._write_meta(tmp, {
+            'key': key, 'model_type': model_type, 'format': fmt,
+            'created': now, 'last_access': now, 'bytes': _dir_bytes(tmp),
+            **metadata,
+        })
+        try:
+            os.replace(tmp, self._path(key))
+        except OSError:
+            # the entry exists: same key = same content, so another process
+            # stored it first; only a leftover without metadata is replaced
+            if not os.path.isdir(self._path(key)):
+                raise
+            if self.metadata(key) is None:
+                shutil.rmtree(self._path(key), ignore_errors=True)
+                with contextlib.suppress(OSError):
+                    os.replace(tmp, self._path(key))
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def record_metrics(self, key: str, metrics: dict) -> None:
+        """
+        Attach evaluation metrics (e.g. {'MAE': .., 'MAPE': ..}) to an entry.
+        """
+        meta = self.metadata(key)
+        if meta is not None:
+            meta['metrics'] = {**meta.get('metrics', {}), **metrics}
+            self._write_meta(self._path(key), meta)
+
+    def get_or_fit(self, model_type: str, train_data, fit, params: dict | None = None):
+        """
+        Return the cached model for this (type, params, data), calling
+        `fit()` and caching the result on a miss.
+        """
+        key   = self.make_key(model_type, train_data, params)
+        model = self.get(key)
+        if model is not None:
+            return model
+        t0    = time.perf_counter()
+        model = fit()
+        meta  = {'params': params or {}, 'fit_seconds': time.perf_counter() - t0,
+                 'n_obs': len(train_data)}
+        if isinstance(train_data, (pd.Series, pd.DataFrame)) and len(train_data):
+            meta['data_start'] = str(train_data.index[0])
+            meta['data_end']   = str(train_data.index[-1])
+        self.put(key, model, model_type, **meta)
+        return model
+
+    def entries(self) -> pd.DataFrame:
+        """
+        One row of metadata per cached model, most recently used first.
+        """
+        metas = [
+            m for m in (self.metadata(k) for k in os.listdir(self.root) if not k.startswith('.'))
+            if m is not None
+        ]
+        if not metas:
+            return pd.DataFrame(columns=['key', 'model_type', 'last_access', 'bytes'])
+        return pd.DataFrame(metas).sort_values('last_access', ascending=False).reset_index(drop=True)
+
+    def evict(self) -> list[str]:
+        """
+        Drop least-recently-used entries until within max_entries/max_bytes.
+        Returns the evicted keys.
+        """
+        if self.max_entries is None and self.max_bytes is None:
+            return []
+        entries = self.entries()
+        evicted = []
+        total   = entries['bytes'].sum()
+        for row in entries.iloc[::-1].itertuples():
+            over_count = self.max_entries is not None and len(entries) - len(evicted) > self.max_entries
+            over_size  = self.max_bytes is not None and total > self.max_bytes
+            if not (over_count or over_size):
+                break
+            shutil.rmtree(self._path(row.key), ignore_errors=True)
+            total -= row.bytes
+            evicted.append(row.key)
+        return evicted
+
+
+def _save_model(model, model_type: str, path: str) -> str:
+    """
+    Serialize `model` into directory `path`; returns the format used.
+    """
+    if model_type == 'lstm':
+        model.save(os.path.join(path, 'model.keras'))
+        return 'keras'
+    if model_type == 'prophet':
+        from prophet.serialize import model_to_json
+        with open(os.path.join(path, 'model.json'), 'w') as f:
+            f.write(model_to_json(model))
+        return 'prophet-json'
+    with open(os.path.join(path, 'model.pkl'), 'wb') as f:
+        pickle.dump(model, f)
+    return 'pickle'
+
+
+def _load_model(path: str, fmt: str):
+    if fmt == 'keras':
+        from tensorflow.keras.models import load_model
+        return load_model(os.path.join(path, 'model.keras'))
+    if fmt == 'prophet-json':
+        from prophet.serialize import model_from_json
+        with open(os.path.join(path, 'model.json')) as f:
+            return model_from_json(f.read())
+    with open(os.path.join(path, 'model.pkl'), 'rb') as f:
+        return pickle.load(f)
@@ -1,9 +1,8 @@
 # src/model_training.py
-
-from pmdarima import auto_arima
-from prophet import Prophet
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
+#
+# Model backends (pmdarima, Prophet/cmdstanpy, TensorFlow) are imported
+# inside the functions that use them: each takes seconds to import, and a
+# caller that only fits ARIMA should not pay for TensorFlow.
 
 def train_arima(train_array):
     """
@@ -14,7 +13,8 @@ def train_arima(train_array):
     # `m=12`: sets the seasonal period (e.g., 12 for monthly data with yearly seasonality)
     # `stepwise=True`: uses a stepwise search to reduce computation time
     # `suppress_warnings=True`: suppresses convergence and other warnings
-    
+    from pmdarima import auto_arima
+
     model = auto_arima(
         train_array,            # Input time series data (e.g., a 1D NumPy array or Pandas Series)
         seasonal=True,          # Enables modeling of seasonal effects
@@ -24,32 +24,95 @@ def train_arima(train_array):
     )
     return model
 
-def train_prophet(df_prophet):
+def search_arima(train_array, n_jobs=-1, max_p=3, max_q=3, max_P=1, max_Q=1):
+    """
+    Full (non-stepwise) auto-ARIMA order search: every candidate of the
+    bounded grid is fitted, spread over `n_jobs` processes (-1: all cores).
+    Slower than the stepwise search on one core but parallel and not
+    path-dependent; meant to run rarely, with `refit_arima` in between.
+    """
+    from pmdarima import auto_arima
+    model = auto_arima(
+        train_array,
+        seasonal=True,
+        m=12,
+        stepwise=False,
+        n_jobs=n_jobs,
+        max_p=max_p, max_q=max_q, max_P=max_P, max_Q=max_Q,
+        max_order=5,
+        suppress_warnings=True
+    )
+    return model
+
+def refit_arima(train_array, order, seasonal_order, with_intercept=True, start_params=None):
+    """
+    Fit only the coefficients of an ARIMA with a known order, optionally
+    starting the optimizer from a previous fit's parameters.
+    """
+    from pmdarima import ARIMA
+    model = ARIMA(order=tuple(order), seasonal_order=tuple(seasonal_order),
+                  with_intercept=with_intercept, start_params=start_params,
+                  suppress_warnings=True)
+    return model.fit(train_array)
+
+def train_prophet(df_prophet, init=None):
     """
     Fit a Prophet model. 
     Expects df_prophet with columns ['ds', 'y'].
+    `init` warm-starts Stan's optimizer, e.g. prophet_warm_start(prev_model).
     """
+    from prophet import Prophet
     m = Prophet(yearly_seasonality=True,
                 weekly_seasonality=False,
                 daily_seasonality=False)
-    m.fit(df_prophet)
+    if init is None:
+        m.fit(df_prophet)
+    else:
+        m.fit(df_prophet, init=init)
     return m
 
-def train_lstm(train_supervised, n_lags, epochs=50, batch_size=32):
+def prophet_warm_start(m):
+    """
+    Fitted parameters of a Prophet model in the form `train_prophet(init=...)`
+    expects, so a refit on slightly longer data starts from the old optimum.
+    """
+    res = {}
+    for pname in ['k', 'm', 'sigma_obs']:
+        res[pname] = m.params[pname][0][0]
+    for pname in ['delta', 'beta']:
+        res[pname] = m.params[pname][0]
+    return res
+
+def fit_lstm(X, y, epochs=50, batch_size=32, model=None):
+    """
+    Train a simple LSTM on windows X shaped [samples, n_lags, 1].
+    y is [samples] for a one-step model or [samples, horizon] for a direct
+    multi-output model that emits the whole horizon in one forward pass.
+    Pass a previously trained `model` to continue training from its weights
+    (warm start) instead of building a new one.
+    """
+    if model is None:
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import LSTM, Dense
+        n_outputs = 1 if y.ndim == 1 else y.shape[1]
+        model = Sequential([
+            LSTM(50, input_shape=X.shape[1:]),
+            Dense(n_outputs)
+        ])
+        model.compile(optimizer='adam', loss='mae')
+    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=2)
+    return model
+
+def train_lstm(train_supervised, n_lags, epochs=50, batch_size=32, model=None):
     """
     Train a simple LSTM on lagged data.
     train_supervised should be a NumPy array where:
       - columns 1..n_lags are inputs
       - column 0 is the target y(t)
+    Pass a previously trained `model` to continue training from its weights
+    (warm start) instead of building a new one.
     """
     # reshape for LSTM [samples, timesteps, features]
     X = train_supervised[:, 1:].reshape(-1, n_lags, 1)
     y = train_supervised[:, 0]
-
-    model = Sequential([
-        LSTM(50, input_shape=(n_lags, 1)),
-        Dense(1)
-    ])
-    model.compile(optimizer='adam', loss='mae')
-    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=2)
-    return model
+    return fit_lstm(X, y, epochs=epochs, batch_size=batch_size, model=model)
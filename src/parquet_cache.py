@@ -0,0 +1,229 @@
+# src/parquet_cache.py
+#
+# Columnar cache of the cleaned complaints CSV: a hive-partitioned Parquet
+# dataset laid out as <cache_dir>/year_month=YYYY-MM/product=<name>/*.parquet
+# so date-range and product filters skip whole directories. Requires pyarrow.
+
+import json
+import os
+import shutil
+import sys
+import time
+
+import pandas as pd
+
+from src.data_ingestion import CATEGORY_COLUMNS, DATE_COLUMN, iter_complaint_chunks
+
+PARTITION_COLUMNS = ['year_month', 'product']
+MANIFEST_FILE     = '_manifest.json'   # '_' prefix: ignored by pyarrow datasets
+
+# Non-text columns of the cleaned CSV. Every other column (besides the date)
+# is text and stored as string: types inferred from a chunk break on sparse
+# text columns, which are all-NaN floats in early chunks and strings later.
+INTEGER_COLUMNS = ['complaint_id']
+
+
+def default_cache_dir(csv_path: str) -> str:
+    """
+    Cache location used when none is given: next to the CSV,
+    e.g. data/processed/cleaned_consumer_complaints_parquet/.
+    """
+    return os.path.splitext(os.fspath(csv_path))[0] + '_parquet'
+
+
+def read_manifest(cache_dir: str) -> dict | None:
+    """
+    Return the cache manifest, or None if no complete cache exists.
+    """
+    path = os.path.join(cache_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(cache_dir: str, manifest: dict) -> None:
+    tmp = os.path.join(cache_dir, MANIFEST_FILE + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, MANIFEST_FILE))
+
+
+def cache_is_fresh(csv_path: str, cache_dir: str | None = None) -> bool:
+    """
+    True if a cache exists for `csv_path` and was built from a version of
+    the CSV at least as new as the one on disk.
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    manifest  = read_manifest(cache_dir)
+    if manifest is None:
+        return False
+    return manifest['source_mtime'] >= os.path.getmtime(csv_path)
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return ds.partitioning(
+        pa.schema([('year_month', pa.string()), ('product', pa.string())]),
+        flavor='hive',
+    )
+
+
+def csv_dtypes(columns) -> dict:
+    """
+    read_csv dtypes that keep every chunk's columns the same type:
+    nullable integers for INTEGER_COLUMNS, str for the other text columns.
+    """
+    return {
+        col: 'Int64' if col in INTEGER_COLUMNS else str
+        for col in columns if col != DATE_COLUMN
+    }
+
+
+def arrow_schema(columns):
+    """
+    Arrow schema of a cache file with `columns` (plus year_month), from
+    the known column types rather than from any chunk's data.
+    """
+    import pyarrow as pa
+    fields = []
+    for col in [*columns, 'year_month']:
+        if col == DATE_COLUMN:
+            fields.append((col, pa.timestamp('ns')))
+        elif col in INTEGER_COLUMNS:
+            fields.append((col, pa.int64()))
+        else:
+            fields.append((col, pa.string()))
+    return pa.schema(fields)
+
+
+def write_partitions(
+    chunk: pd.DataFrame,
+    cache_dir: str,
+    basename: str,
+    schema=None
+):
+    """
+    Append one chunk of complaint rows to the partitioned dataset under
+    `cache_dir` as new files named `<basename>-<n>.parquet`, converted to
+    `schema` (default: `arrow_schema` of the chunk's columns). Returns the
+    schema so later chunks are written with the same one.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    chunk = chunk.copy()
+    chunk['year_month'] = chunk[DATE_COLUMN].dt.strftime('%Y-%m')
+    if schema is None:
+        schema = arrow_schema([c for c in chunk.columns if c != 'year_month'])
+    # categoricals go in as plain strings (partition keys must not be dictionary-encoded)
+    for col in chunk.columns:
+        if isinstance(chunk[col].dtype, pd.CategoricalDtype):
+            chunk[col] = chunk[col].astype(object)
+    table = pa.Table.from_pandas(chunk[schema.names], schema=schema, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        cache_dir,
+        format='parquet',
+        partitioning=_partitioning(),
+        basename_template=basename + '-{i}.parquet',
+        existing_data_behavior='overwrite_or_ignore',
+    )
+    return schema
+
+
+def build_parquet_cache(
+    csv_path: str,
+    cache_dir: str | None = None,
+    chunksize: int = 500_000
+) -> str:
+    """
+    One-time conversion of the cleaned CSV into the partitioned Parquet
+    cache. The CSV is streamed chunk by chunk and the new cache replaces
+    any previous one only once it is complete. Returns the cache directory.
+    """
+    cache_dir    = cache_dir or default_cache_dir(csv_path)
+    tmp_dir      = cache_dir + '.tmp'
+    source_mtime = os.path.getmtime(csv_path)
+    source_size  = os.path.getsize(csv_path)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    chunks = iter_complaint_chunks(csv_path, chunksize=chunksize, dtype=csv_dtypes(header))
+    schema, columns, n_rows = None, None, 0
+    for i, chunk in enumerate(chunks):
+        columns = columns or list(chunk.columns)
+        schema  = write_partitions(chunk, tmp_dir, f'part-{i:05d}', schema)
+        n_rows += len(chunk)
+
+    write_manifest(tmp_dir, {
+        'source':       os.path.abspath(csv_path),
+        'source_mtime': source_mtime,
+        'source_size':  source_size,
+        'built_at':     time.time(),
+        'columns':      columns,
+        'rows':         n_rows,
+    })
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return cache_dir
+
+
+def read_parquet_cache(
+    cache_dir: str,
+    usecols: list[str] | None = None,
+    start=None,
+    end=None,
+    products: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Read complaints from the cache, in the same shape as `load_complaints`
+    (date index, sorted; product/issue/state/company categorical).
+
+    `start`/`end` (inclusive) and `products` are pushed down to the
+    partition layout, so only the matching year-month/product directories
+    are opened.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    manifest = read_manifest(cache_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No Parquet cache found in {cache_dir}")
+    columns = manifest['columns']
+    if usecols is not None:
+        columns = [c for c in columns if c == DATE_COLUMN or c in usecols]
+
+    dataset = ds.dataset(cache_dir, format='parquet', partitioning=_partitioning())
+    date    = ds.field(DATE_COLUMN)
+    filters = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters += [ds.field('year_month') >= start.strftime('%Y-%m'),
+                    date >= pa.scalar(start.to_datetime64())]
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters += [ds.field('year_month') <= end.strftime('%Y-%m'),
+                    date <= pa.scalar(end.to_datetime64())]
+    if products is not None:
+        filters.append(ds.field('product').isin(list(products)))
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    # ignore the stored pandas metadata: nullable Int64 read dtypes come back
+    # as int64 (float64 with gaps), as from the CSV
+    df = dataset.to_table(columns=columns, filter=expr).to_pandas(ignore_metadata=True)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df.set_index(DATE_COLUMN).sort_index()
+
+
+if __name__ == "__main__":
+    # python -m src.parquet_cache path/to/cleaned_consumer_complaints.csv [cache_dir]
+    out = build_parquet_cache(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Parquet cache written to {out}")
@@ -0,0 +1,248 @@
+# src/streaming_anomaly.py
+#
+# Online spike detection: observations arrive one at a time (or in small
+# batches) and each is scored against the state built from the points
+# before it, so today's spike is flagged today. State is O(window) per
+# series and can be snapshotted to disk so a nightly job resumes where the
+# previous run stopped.
+
+import json
+import math
+import os
+from collections import deque
+
+import pandas as pd
+
+ALERT_COLUMNS = ['series', 'date', 'alert_type', 'value', 'zscore']
+
+
+class _RollingState:
+    """
+    Mean/variance of the last `window` values, updated in O(1) per point
+    with Welford's algorithm (adding the new value, removing the oldest).
+    Add/remove rounding errors accumulate over long streams, so mean and M2
+    are recomputed exactly from the window every `RECOMPUTE_EVERY` points.
+    """
+
+    RECOMPUTE_EVERY = 1000
+
+    def __init__(self, window: int):
+        self.values   = deque(maxlen=window)
+        self.mean     = 0.0
+        self.m2       = 0.0
+        self._updates = 0
+
+    @property
+    def n(self) -> int:
+        return len(self.values)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(max(self.m2, 0.0) / self.n) if self.n else 0.0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            n   = self.n - 1
+            if n == 0:
+                self.mean, self.m2 = 0.0, 0.0
+            else:
+                d = old - self.mean
+                self.mean -= d / n
+                self.m2   -= d * (old - self.mean)
+        self.values.append(x)
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2   += d * (x - self.mean)
+        self._updates += 1
+        if self._updates % self.RECOMPUTE_EVERY == 0:
+            self.recompute()
+
+    def recompute(self) -> None:
+        """
+        Exact mean and M2 of the current window (two-pass).
+        """
+        self.mean = math.fsum(self.values) / self.n
+        self.m2   = math.fsum((v - self.mean) ** 2 for v in self.values)
+
+    def to_dict(self) -> dict:
+        return {'values': list(self.values), 'mean': self.mean, 'm2': self.m2,
+                'updates': self._updates}
+
+    @classmethod
+    def from_dict(cls, window: int, d: dict) -> '_RollingState':
+        state = cls(window)
+        state.values.extend(d['values'])
+        state.mean, state.m2 = d['mean'], d['m2']
+        state._updates = d.get('updates', 0)     # absent in older snapshots
+        return state
+
+
+class _EwmaState:
+    """
+    Exponentially weighted mean/variance with smoothing factor `alpha`.
+    """
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.n     = 0
+        self.mean  = 0.0
+        self.var   = 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    def push(self, x: float) -> None:
+        if self.n == 0:
+            self.mean = x
+        else:
+            d = x - self.mean
+            self.mean += self.alpha * d
+            self.var   = (1 - self.alpha) * (self.var + self.alpha * d * d)
+        self.n += 1
+
+    def to_dict(self) -> dict:
+        return {'n': self.n, 'mean': self.mean, 'var': self.var}
+
+    @classmethod
+    def from_dict(cls, alpha: float, d: dict) -> '_EwmaState':
+        state = cls(alpha)
+        state.n, state.mean, state.var = d['n'], d['mean'], d['var']
+        return state
+
+
+class StreamingSpikeDetector:
+    """
+    Flag observations whose z-score against the preceding points exceeds
+    `z_thresh`, one series or many (keyed, e.g. by product) at a time.
+
+    Args:
+        window: number of trailing points in the rolling mean/std
+            (method='rolling'); also sets the EWMA span when `alpha` is None.
+        z_thresh: absolute z-score threshold to flag a spike.
+        method: 'rolling' (trailing-window Welford) or 'ewma'.
+        alpha: EWMA smoothing factor, default 2 / (window + 1).
+        min_periods: points a series needs before it can alert.
+    """
+
+    def __init__(
+        self,
+        window: int = 12,
+        z_thresh: float = 3.0,
+        method: str = 'rolling',
+        alpha: float | None = None,
+        min_periods: int = 3
+    ):
+        if method not in ('rolling', 'ewma'):
+            raise ValueError(f"Unknown method {method!r}; use 'rolling' or 'ewma'")
+        self.window      = window
+        self.z_thresh    = z_thresh
+        self.method      = method
+        self.alpha       = alpha if alpha is not None else 2 / (window + 1)
+        self.min_periods = min_periods
+        self._states     = {}
+        self._last_seen  = {}
+
+    def _new_state(self):
+        if self.method == 'rolling':
+            return _RollingState(self.window)
+        return _EwmaState(self.alpha)
+
+    def update(self, value: float, date=None, key=None) -> dict | None:
+        """
+        Score one observation of series `key`, then absorb it into the state.
+        Points dated at or before the last one seen for `key` are ignored,
+        so replaying an overlapping batch after a restart is harmless.
+
+        Returns an alert record (see ALERT_COLUMNS) or None.
+        """
+        if date is not None:
+            date = pd.Timestamp(date)
+            last = self._last_seen.get(key)
+            if last is not None and date <= last:
+                return None
+            self._last_seen[key] = date
+
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = self._new_state()
+
+        alert = None
+        value = float(value)
+        if state.n >= self.min_periods and not math.isnan(value):
+            std = state.std
+            dev = value - state.mean
+            z   = dev / std if std > 0 else (math.copysign(math.inf, dev) if dev else 0.0)
+            if abs(z) > self.z_thresh:
+                alert = {'series': key, 'date': date, 'alert_type': 'spike',
+                         'value': value, 'zscore': z}
+        if not math.isnan(value):
+            state.push(value)
+        return alert
+
+    def update_many(self, data, key=None) -> pd.DataFrame:
+        """
+        Feed a micro-batch: a date-indexed Series for one series `key`, or a
+        wide date x series DataFrame (one column per key). Rows are consumed
+        in date order. Returns the alerts raised, as a DataFrame.
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame(name=key)
+        data   = data.sort_index()
+        keys   = list(data.columns)
+        alerts = []
+        for date, row in zip(data.index, data.to_numpy(dtype=float)):
+            for k, value in zip(keys, row):
+                alert = self.update(value, date=date, key=k)
+                if alert is not None:
+                    alerts.append(alert)
+        return pd.DataFrame(alerts, columns=ALERT_COLUMNS)
+
+    def state_dict(self) -> dict:
+        return {
+            'config': {
+                'window': self.window, 'z_thresh': self.z_thresh,
+                'method': self.method, 'alpha': self.alpha,
+                'min_periods': self.min_periods,
+            },
+            'series': [
+                {
+                    'key': key,
+                    'state': state.to_dict(),
+                    'last_seen': (self._last_seen[key].isoformat()
+                                  if key in self._last_seen else None),
+                }
+                for key, state in self._states.items()
+            ],
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Snapshot configuration and per-series state to a JSON file
+        (series keys must be JSON-serializable).
+        """
+        tmp = os.fspath(path) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.state_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StreamingSpikeDetector':
+        """
+        Restore a detector saved with `save`.
+        """
+        with open(path) as f:
+            snapshot = json.load(f)
+        detector = cls(**snapshot['config'])
+        for entry in snapshot['series']:
+            key = entry['key']
+            if isinstance(key, list):      # JSON turns tuple keys into lists
+                key = tuple(key)
+            if detector.method == 'rolling':
+                detector._states[key] = _RollingState.from_dict(detector.window, entry['state'])
+            else:
+                detector._states[key] = _EwmaState.from_dict(detector.alpha, entry['state'])
+            if entry['last_seen'] is not None:
+                detector._last_seen[key] = pd.Timestamp(entry['last_seen'])
+        return detector
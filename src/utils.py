@@ -2,8 +2,6 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics import mean_absolute_error
-import matplotlib.pyplot as plt
 
 def mean_absolute_percentage_error(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     """
@@ -30,6 +28,7 @@ def evaluate_forecasts(
     pd.DataFrame
         Indexed by model name, with columns [MAE, MAPE].
     """
+    from sklearn.metrics import mean_absolute_error
     records = []
     for name, pred in y_preds.items():
         mae  = mean_absolute_error(y_true, pred)
@@ -43,6 +42,7 @@ def plot_with_alerts(series, alerts):
     series : pd.Series indexed by date
     alerts : DataFrame with columns ['date','alert_type']
     """
+    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(10,4))
     ax.plot(series.index, series.values, label='Monthly count')
     for _, row in alerts.iterrows():
@@ -4,7 +4,9 @@ import pandas as pd
 import numpy as np
 import pytest
 
-from src.anomaly_detection import generate_alerts_report
+from src.anomaly_detection import (
+    detect_change_points, generate_alerts_report, generate_panel_alerts
+)
 
 @pytest.fixture
 def spike_series():
@@ -45,3 +47,80 @@ def test_no_alerts_for_flat_series(flat_series):
         pen=10
     )
     assert alerts.empty
+
+@pytest.fixture
+def level_shift_series():
+    # three regimes of daily counts
+    rng = np.random.default_rng(0)
+    values = np.concatenate([
+        rng.normal(100, 5, 200), rng.normal(160, 5, 150), rng.normal(120, 5, 250)
+    ])
+    return pd.Series(values, index=pd.date_range("2020-01-01", periods=600, freq="D"))
+
+@pytest.mark.parametrize("model", ["l2", "normal"])
+def test_linear_change_points_match_ruptures_pelt(level_shift_series, model):
+    pen = 5000 if model == "l2" else 50
+    expected = detect_change_points(level_shift_series, model=model, pen=pen, method="pelt")
+    assert detect_change_points(level_shift_series, model=model, pen=pen, method="linear") == expected
+    assert [d.strftime("%Y-%m-%d") for d in expected] == ["2020-07-19", "2020-12-16"]
+
+def test_binseg_and_incremental_change_points(level_shift_series):
+    found = detect_change_points(level_shift_series, model="l2", pen=5000, method="binseg")
+    assert found == [pd.Timestamp("2020-07-19"), pd.Timestamp("2020-12-16")]
+    # only the tail after the first confirmed break is searched
+    tail = detect_change_points(
+        level_shift_series, model="l2", pen=5000, method="linear", since=found[0]
+    )
+    assert tail == [pd.Timestamp("2020-12-16")]
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_panel_alerts_match_per_series_reports(max_workers):
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2015-01-31", periods=60, freq="M")
+    wide = pd.DataFrame(
+        rng.poisson(100, size=(60, 5)).astype(float),
+        index=dates, columns=[f"product_{i}" for i in range(5)],
+    )
+    wide.iloc[30, 1] = 400
+    wide.iloc[40:, 3] += 80
+    long = wide.stack().rename_axis(["date", "series"]).rename("value").reset_index()
+
+    panel = generate_panel_alerts(
+        long, window=12, z_thresh=3.0, model="l2", pen=20000,
+        cp_method="linear", max_workers=max_workers, batch_size=2,
+    )
+    expected = pd.concat([
+        generate_alerts_report(wide[col], window=12, z_thresh=3.0, model="l2",
+                               pen=20000, cp_method="linear").assign(series=col)
+        for col in wide.columns
+    ])
+    key = lambda df: sorted(zip(df["series"], df["date"], df["alert_type"]))
+    assert key(panel) == key(expected)
+    assert ("product_1", dates[30], "spike") in key(panel)
+    assert ("product_3", dates[40], "change_point") in key(panel)
+
+
+def test_panel_alerts_fill_missing_rows_with_zero():
+    rng = np.random.default_rng(4)
+    dates = pd.date_range("2015-01-31", periods=48, freq="M")
+    wide = pd.DataFrame(
+        rng.poisson(100, size=(48, 3)).astype(float),
+        index=dates, columns=["a", "b", "c"],
+    )
+    wide.iloc[20:, 2] += 60
+    wide.iloc[[10, 25], 0] = 0           # months with no complaints for "a"
+    wide.iloc[33] = 0                    # a month with no rows at all
+    long = wide.stack().rename_axis(["date", "series"]).rename("value").reset_index()
+    long = long[long["value"] > 0]       # zero counts have no rows in a long panel
+
+    with pytest.raises(ValueError, match="freq"):
+        generate_panel_alerts(long, max_workers=1)
+    panel = generate_panel_alerts(long, model="l2", pen=20000, cp_method="linear",
+                                  freq="M", max_workers=1)
+    expected = pd.concat([
+        generate_alerts_report(wide[col], model="l2", pen=20000,
+                               cp_method="linear").assign(series=col)
+        for col in wide.columns
+    ])
+    key = lambda df: sorted(zip(df["series"], df["date"], df["alert_type"]))
+    assert key(panel) == key(expected)
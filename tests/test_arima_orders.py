@@ -0,0 +1,74 @@
+# tests/test_arima_orders.py
+
+import numpy as np
+import pytest
+
+import src.model_training as model_training
+from src.arima_orders import ArimaOrderCache
+
+
+@pytest.fixture
+def seasonal_values():
+    rng = np.random.default_rng(0)
+    t = np.arange(72)
+    return 500 + 3 * t + 60 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 10, len(t))
+
+
+def test_order_is_searched_once_then_refitted(tmp_path, seasonal_values, monkeypatch):
+    searches = []
+    search   = model_training.search_arima
+
+    def counting_search(train_array, n_jobs=-1, **kwargs):
+        searches.append(len(train_array))
+        return search(train_array, n_jobs=1, max_p=2, max_q=2, max_P=1, max_Q=1)
+
+    monkeypatch.setattr(model_training, "search_arima", counting_search)
+    cache = ArimaOrderCache(tmp_path, research_every=2, min_pvalue=0.0)
+
+    first = cache.fit("Mortgage", seasonal_values[:60])
+    for n in (63, 66):
+        model = cache.fit("Mortgage", seasonal_values[:n])
+        assert model.order == first.order
+    assert searches == [60]
+    assert cache.get("Mortgage")["refits"] == 2
+
+    cache.fit("Mortgage", seasonal_values)       # research_every reached
+    assert searches == [60, 72]
+    assert cache.get("Mortgage")["refits"] == 0
+
+
+def test_degraded_residuals_trigger_research(tmp_path, seasonal_values, monkeypatch):
+    searches = []
+    monkeypatch.setattr(
+        model_training, "search_arima",
+        lambda train_array, n_jobs=-1: searches.append(1) or model_training.refit_arima(
+            train_array, (0, 1, 0), (0, 0, 0, 12)
+        ),
+    )
+    cache = ArimaOrderCache(tmp_path, min_pvalue=1.01)   # every refit "fails"
+    cache.fit("Credit card", seasonal_values[:60])
+    cache.fit("Credit card", seasonal_values)
+    assert len(searches) == 2
+
+
+def test_readonly_cache_and_seed_never_look_ahead(tmp_path, seasonal_values, monkeypatch):
+    searches = []
+    monkeypatch.setattr(
+        model_training, "search_arima",
+        lambda train_array, n_jobs=-1: searches.append(len(train_array)) or model_training.refit_arima(
+            train_array, (1, 1, 0), (0, 0, 0, 12)
+        ),
+    )
+    ArimaOrderCache(tmp_path).fit("Mortgage", seasonal_values)      # found on all 72 points
+    cache = ArimaOrderCache(tmp_path)
+    cache.seed("Mortgage", seasonal_values[:48])                     # re-selected on the cutoff
+    assert searches == [72, 48] and cache.get("Mortgage")["n_obs"] == 48
+
+    frozen = ArimaOrderCache(tmp_path, readonly=True, min_pvalue=0.0)
+    frozen.fit("Mortgage", seasonal_values[:60])
+    frozen.fit("Student loan", seasonal_values[:60])                 # searched, not recorded
+    assert searches == [72, 48, 60]
+    assert cache.get("Mortgage")["refits"] == 0 and cache.get("Student loan") is None
+
+    with pytest.raises(ValueError, match="series key"):
+        cache.fit(None, seasonal_values)
@@ -0,0 +1,64 @@
+# tests/test_backtesting.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting import rolling_origins, walk_forward_backtest
+
+
+def last_value(train, horizon):
+    return np.repeat(float(train.iloc[-1]), horizon)
+
+
+def last_value_chain(series, cuts, horizon):
+    return [np.repeat(float(series.iloc[cut - 1]), horizon) for cut in cuts]
+
+
+def fails_on_short_windows(train, horizon):
+    if len(train) < 30:
+        raise np.linalg.LinAlgError("Singular matrix")
+    return last_value(train, horizon)
+
+
+@pytest.fixture
+def trend_series():
+    dates = pd.date_range("2018-01-31", periods=36, freq="M")
+    return pd.Series(np.arange(1, 37, dtype=float), index=dates)
+
+
+def test_rolling_origins():
+    assert rolling_origins(36, n_origins=4, horizon=3, step=2) == [27, 29, 31, 33]
+    with pytest.raises(ValueError):
+        rolling_origins(10, n_origins=10, horizon=3)
+
+
+@pytest.mark.parametrize("strategy, models", [
+    ("refit",  {"Naive": last_value}),
+    ("update", {"Naive": last_value_chain}),
+])
+def test_walk_forward_backtest(trend_series, strategy, models):
+    preds, metrics = walk_forward_backtest(
+        trend_series, n_origins=6, horizon=3, models=models,
+        strategy=strategy, n_chains=2, max_workers=2,
+    )
+    assert len(preds) == 6 * 3
+    assert preds["origin"].nunique() == 6
+    # a last-value forecast on a +1/period trend is off by exactly `step`
+    assert (preds["actual"] - preds["forecast"] == preds["step"]).all()
+    assert metrics.loc["Naive", "MAE"] == pytest.approx(2.0)
+
+
+def test_failing_fold_is_isolated(trend_series):
+    preds, metrics = walk_forward_backtest(
+        trend_series, n_origins=6, horizon=3, max_workers=2,
+        models={"Naive": last_value, "Fragile": fails_on_short_windows},
+    )
+    fragile = preds[preds["model"] == "Fragile"]
+    failed  = fragile["forecast"].isna()
+    assert failed.sum() == 2 * 3                        # origins with < 30 points
+    assert (fragile.loc[failed, "error"] == "Singular matrix").all()
+    assert fragile.loc[~failed, "error"].isna().all()
+    assert metrics.loc["Naive", "MAE"] == pytest.approx(2.0)
+    assert np.isnan(metrics.loc["Fragile", "MAE"])
+    assert metrics.loc["Fragile", "error"] == "Singular matrix"
@@ -0,0 +1,35 @@
+# tests/test_batch_forecasting.py
+
+import numpy as np
+import pandas as pd
+
+from src.batch_forecasting import forecast_panel
+
+
+def naive_forecast(train, horizon):
+    if (train < 0).any():
+        raise ValueError("negative counts")
+    return np.repeat(train.iloc[-1], horizon).astype(float)
+
+
+def test_forecast_panel_isolates_failing_series():
+    dates  = pd.date_range("2020-01-31", periods=24, freq="M")
+    counts = pd.DataFrame({
+        "Credit card": np.arange(24),
+        "Mortgage":    np.r_[np.zeros(6), np.arange(18)],
+        "Broken":      -np.ones(24),
+    }, index=dates)
+
+    forecasts, summary = forecast_panel(
+        counts, test_periods=3, models={"Naive": naive_forecast}, max_workers=2
+    )
+
+    assert list(summary.index) == ["Credit card", "Mortgage", "Broken"]
+    assert summary.loc["Broken", "error"] == "negative counts"
+    assert summary["error"].isna().sum() == 2
+
+    cc = forecasts[forecasts["series"] == "Credit card"]
+    assert list(cc["date"]) == list(dates[-3:])
+    assert (cc["forecast"] == 20.0).all()
+    assert (cc["actual"].values == [21, 22, 23]).all()
+    assert set(forecasts["series"]) == {"Credit card", "Mortgage"}
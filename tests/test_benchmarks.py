@@ -0,0 +1,35 @@
+# tests/test_benchmarks.py
+
+import pandas as pd
+
+from benchmarks.suite import compare
+from benchmarks.synthetic import write_synthetic_csv
+
+
+def test_synthetic_csv_loads_like_the_cleaned_data(tmp_path):
+    from src.data_ingestion import load_complaints
+
+    path = write_synthetic_csv(str(tmp_path / "c.csv"), 5_000, n_products=7, chunksize=2_000)
+    df   = load_complaints(path, chunksize=1_000)
+
+    assert len(df) == 5_000
+    assert list(df.columns) == ["product", "issue", "state", "company", "complaint_id"]
+    assert df["product"].nunique() == 7
+    assert df.index.is_monotonic_increasing and df.index.min() >= pd.Timestamp("2015-01-01")
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {
+        "slow":  {"seconds": 2.0, "peak_mb": 100.0},
+        "tiny":  {"seconds": 0.001, "peak_mb": 1.0},
+        "fatter": {"seconds": 1.0, "peak_mb": 10.0},
+    }}
+    results = {"results": {
+        "slow":  {"seconds": 3.0, "peak_mb": 100.0},    # +50%: regression
+        "tiny":  {"seconds": 0.004, "peak_mb": 1.0},    # 4x but only +3 ms: noise
+        "fatter": {"seconds": 1.0, "peak_mb": 20.0},    # memory doubled
+        "new":   {"seconds": 9.0, "peak_mb": None},     # not in baseline
+    }}
+
+    regressions = compare(results, baseline, threshold=0.25)
+    assert [r.split(":")[0] for r in regressions] == ["slow", "fatter"]
@@ -0,0 +1,89 @@
+# tests/test_cli.py
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import main, parse_models
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+# Import budget for the CLI and the forecasting/alerting entry modules: no
+# model backend may be loaded until a model is actually fitted.
+STARTUP_SECONDS = 3.0
+HEAVY_MODULES   = ['tensorflow', 'prophet', 'cmdstanpy', 'pmdarima', 'matplotlib',
+                   'sklearn', 'ruptures', 'statsmodels']
+
+STARTUP_PROBE = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import src.cli, src.forecasting, src.anomaly_detection, src.batch_forecasting, src.backtesting
+print(json.dumps({{
+    'seconds': time.perf_counter() - t0,
+    'loaded':  [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def test_startup_is_fast_and_loads_no_model_backends():
+    out = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    probe = json.loads(out.stdout.strip().splitlines()[-1])
+
+    assert probe["loaded"] == []
+    assert probe["seconds"] < STARTUP_SECONDS
+
+
+def test_parse_models():
+    assert parse_models("arima, Prophet") == ["ARIMA", "Prophet"]
+    with pytest.raises(Exception):
+        parse_models("arima,xgboost")
+
+
+@pytest.fixture
+def complaints_csv(tmp_path):
+    rng   = np.random.default_rng(0)
+    dates = pd.to_datetime("2019-01-01") + pd.to_timedelta(
+        rng.integers(0, 3 * 365, size=2_000), unit="D"
+    )
+    csv = tmp_path / "complaints.csv"
+    pd.DataFrame({
+        "date_received": dates,
+        "product": rng.choice(["Credit card", "Mortgage"], len(dates)),
+    }).to_csv(csv, index=False)
+    return csv
+
+
+def test_alerts_command_writes_report(complaints_csv, tmp_path):
+    csv = complaints_csv
+    out = tmp_path / "alerts.csv"
+
+    assert main(["alerts", str(csv), "--by", "product", "--workers", "1",
+                 "--out", str(out)]) == 0
+    assert list(pd.read_csv(out).columns) == ["series", "date", "alert_type"]
+
+
+def test_forecast_command_skips_series_where_every_model_failed(complaints_csv, monkeypatch, capsys):
+    import src.batch_forecasting as batch_forecasting
+    from src.batch_forecasting import FORECAST_COLUMNS
+
+    def fake_panel(counts, test_periods, **kwargs):
+        dates = counts.index[-test_periods:]
+        rows  = [
+            {"series": key, "date": d, "model": "ARIMA", "actual": 1.0,
+             "forecast": np.nan if key == "Mortgage" else 1.0, "fit_seconds": 0.0}
+            for key in counts.columns for d in dates
+        ]
+        summary = pd.DataFrame({"error": [None] * counts.shape[1]}, index=counts.columns)
+        return pd.DataFrame(rows, columns=FORECAST_COLUMNS), summary
+
+    monkeypatch.setattr(batch_forecasting, "forecast_panel", fake_panel)
+    assert main(["forecast", str(complaints_csv), "--by", "product", "--models", "arima"]) == 0
+    out = capsys.readouterr().out
+    assert "every model failed for 'Mortgage'" in out
+    assert "Credit card:" in out
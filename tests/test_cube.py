@@ -0,0 +1,74 @@
+# tests/test_cube.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cube import (
+    TOTAL_SERIES, build_cube, cube_version, load_alerts, load_forecasts,
+    load_product_counts, load_totals, write_forecasts
+)
+from src.data_ingestion import count_complaints
+
+
+@pytest.fixture
+def complaints_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime("2019-01-01") + pd.to_timedelta(
+        rng.integers(0, 3 * 365, size=2_000), unit="D"
+    )
+    df = pd.DataFrame({
+        "date_received": dates,
+        "product": rng.choice(["Credit card", "Mortgage", "Student loan"], len(dates)),
+        "state": rng.choice(["CA", "NY", "TX"], len(dates)),
+    })
+    path = tmp_path / "complaints.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_cube_counts_match_direct_aggregation(complaints_csv, tmp_path):
+    cube_dir = build_cube(complaints_csv, tmp_path / "cube")
+
+    expected = count_complaints(complaints_csv, freq="M", by="product", use_cache=False)
+    totals   = load_totals(cube_dir)
+    pd.testing.assert_frame_equal(totals, expected, check_names=False, check_freq=False)
+
+    mortgage = load_product_counts(cube_dir, "Mortgage")
+    assert list(mortgage.columns) == ["CA", "NY", "TX"]
+    assert (mortgage.sum(axis=1).values == totals["Mortgage"].values).all()
+
+    # alerts precomputed for every product and the total
+    assert set(load_alerts(cube_dir)["series"]) <= {*totals.columns, TOTAL_SERIES}
+
+
+def test_missing_state_is_kept(complaints_csv, tmp_path):
+    df = pd.read_csv(complaints_csv)
+    df.loc[::7, "state"] = np.nan
+    df.loc[3::11, "product"] = np.nan
+    df.to_csv(complaints_csv, index=False)
+
+    cube_dir = build_cube(complaints_csv, tmp_path / "cube", alerts=False)
+
+    totals = load_totals(cube_dir)
+    assert totals.values.sum() == len(df)
+    assert totals["Unknown"].sum() == df["product"].isna().sum()
+    mortgage = load_product_counts(cube_dir, "Mortgage")
+    assert "Unknown" in mortgage.columns
+    assert (mortgage.sum(axis=1).values == totals["Mortgage"].values).all()
+
+
+def test_writes_replace_series_and_bump_version(complaints_csv, tmp_path):
+    cube_dir = build_cube(complaints_csv, tmp_path / "cube", alerts=False)
+    v0 = cube_version(cube_dir)
+
+    dates = pd.date_range("2021-10-31", periods=3, freq="M")
+    fc = pd.DataFrame({"series": "Mortgage", "date": dates, "model": "ARIMA",
+                       "actual": [1.0, 2.0, 3.0], "forecast": [1.5, 2.5, 3.5]})
+    write_forecasts(cube_dir, fc)
+    write_forecasts(cube_dir, fc.assign(series=TOTAL_SERIES))
+    write_forecasts(cube_dir, fc.assign(forecast=[9.0, 9.0, 9.0]))
+
+    assert cube_version(cube_dir) != v0
+    assert len(load_forecasts(cube_dir)) == 6
+    assert load_forecasts(cube_dir, "Mortgage")["forecast"].tolist() == [9.0, 9.0, 9.0]
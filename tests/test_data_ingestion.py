@@ -0,0 +1,108 @@
+# tests/test_data_ingestion.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_ingestion import count_complaints, load_complaints, resample_counts
+
+
+@pytest.fixture
+def complaints_csv(tmp_path):
+    # ~3 years of shuffled daily complaints across a few products/states,
+    # with an empty month in the middle
+    rng = np.random.default_rng(0)
+    dates = pd.to_datetime("2019-01-01") + pd.to_timedelta(
+        rng.integers(0, 3 * 365, size=2_000), unit="D"
+    )
+    dates = dates[(dates < "2020-03-01") | (dates >= "2020-04-01")]
+    df = pd.DataFrame({
+        "date_received": dates,
+        "product": rng.choice(["Credit card", "Mortgage", "Student loan"], len(dates)),
+        "issue": rng.choice(["Billing", "Fraud"], len(dates)),
+        "state": rng.choice(["CA", "NY", "TX"], len(dates)),
+        "company": rng.choice(["A", "B"], len(dates)),
+        "complaint_id": np.arange(len(dates)),
+    })
+    path = tmp_path / "complaints.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_chunked_load_matches_full_load(complaints_csv):
+    full    = load_complaints(complaints_csv)
+    chunked = load_complaints(complaints_csv, usecols=["product", "state"], chunksize=300)
+
+    assert list(chunked.columns) == ["product", "state"]
+    assert isinstance(chunked["product"].dtype, pd.CategoricalDtype)
+    assert chunked.index.equals(full.index)
+    assert (chunked["product"].astype(str).values == full["product"].values).all()
+
+
+def test_count_complaints_matches_resample(complaints_csv):
+    expected = load_complaints(complaints_csv).resample("M").size()
+    counts   = count_complaints(complaints_csv, freq="M", chunksize=250)
+    pd.testing.assert_series_equal(counts, expected)
+
+
+def test_count_complaints_by_product(complaints_csv):
+    expected = resample_counts(load_complaints(complaints_csv), freq="W", by="product")
+    counts   = count_complaints(complaints_csv, freq="W", by="product", chunksize=250)
+    pd.testing.assert_frame_equal(counts, expected)
+    assert counts.sum().sum() == len(load_complaints(complaints_csv))
+
+
+def test_parquet_cache_is_used_and_filters(complaints_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    from src.parquet_cache import build_parquet_cache, cache_is_fresh
+
+    cache_dir = str(tmp_path / "cache")
+    from_csv  = load_complaints(complaints_csv, use_cache=False)
+    build_parquet_cache(complaints_csv, cache_dir, chunksize=500)
+    assert cache_is_fresh(complaints_csv, cache_dir)
+
+    cached = load_complaints(complaints_csv, cache_dir=cache_dir)
+    assert list(cached.columns) == list(from_csv.columns)
+    chunked = load_complaints(complaints_csv, chunksize=500, use_cache=False)
+    assert dict(cached.dtypes.map(str)) == dict(chunked.dtypes.map(str))
+    assert (cached.dtypes[["product", "issue", "state", "company"]] == "category").all()
+    pd.testing.assert_series_equal(
+        cached.resample("M").size(), from_csv.resample("M").size()
+    )
+
+    subset = load_complaints(
+        complaints_csv, usecols=["state"], cache_dir=cache_dir,
+        start="2020-06-01", end="2020-12-31", products=["Mortgage"],
+    )
+    expected = load_complaints(
+        complaints_csv, usecols=["state"], use_cache=False,
+        start="2020-06-01", end="2020-12-31", products=["Mortgage"],
+    )
+    assert list(subset.columns) == ["state"]
+    assert subset.index.equals(expected.index)
+    assert sorted(subset["state"].astype(str)) == sorted(expected["state"])
+
+    pd.testing.assert_series_equal(
+        count_complaints(complaints_csv, cache_dir=cache_dir),
+        count_complaints(complaints_csv, use_cache=False),
+    )
+
+
+def test_parquet_cache_with_sparse_text_column(complaints_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    from src.parquet_cache import build_parquet_cache
+
+    df = pd.read_csv(complaints_csv)
+    df["narrative"] = np.nan                 # empty in the first chunks ...
+    df.loc[1500:, "narrative"] = "late text"  # ... text later
+    df.loc[1600:1700, "narrative"] = "12345"  # numeric-looking text
+    df.to_csv(complaints_csv, index=False)
+
+    cache_dir = str(tmp_path / "cache")
+    build_parquet_cache(complaints_csv, cache_dir, chunksize=500)
+
+    cached = load_complaints(complaints_csv, cache_dir=cache_dir)
+    assert len(cached) == len(df)
+    assert cached["narrative"].notna().sum() == (len(df) - 1500)
+    assert (cached["narrative"].dropna().isin(["late text", "12345"])).all()
+    assert cached["complaint_id"].dtype.kind == "i"
@@ -0,0 +1,77 @@
+# tests/test_delta_ingestion.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_ingestion import count_complaints
+from src.delta_ingestion import ingest_delta, read_counts, read_state
+
+
+def _complaints(start_id, n, start_date, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(0, 60, n), unit="D")
+    return pd.DataFrame({
+        "date_received": np.sort(dates.values),
+        "product": rng.choice(["Credit card", "Mortgage"], n),
+        "state": rng.choice(["CA", "NY"], n),
+        "complaint_id": np.arange(start_id, start_id + n),
+    })
+
+
+@pytest.fixture
+def source_csv(tmp_path):
+    path = tmp_path / "complaints.csv"
+    _complaints(0, 500, "2021-01-01", seed=1).to_csv(path, index=False)
+    return path
+
+
+def test_appended_rows_only_are_ingested(source_csv, tmp_path):
+    store = tmp_path / "store"
+    assert ingest_delta(source_csv, store) == 500
+    assert ingest_delta(source_csv, store) == 0
+
+    _complaints(500, 40, "2021-03-01", seed=2).to_csv(
+        source_csv, mode="a", header=False, index=False
+    )
+    assert ingest_delta(source_csv, store) == 40
+    assert read_state(store)["last_id"] == 539
+
+    full = count_complaints(source_csv, freq="D", by="product", use_cache=False)
+    pd.testing.assert_frame_equal(read_counts(store, freq="D", by="product"), full)
+    pd.testing.assert_series_equal(
+        read_counts(store, freq="M"),
+        count_complaints(source_csv, freq="M", use_cache=False),
+    )
+
+
+def test_delta_file_is_filtered_by_high_water_mark(source_csv, tmp_path):
+    store = tmp_path / "store"
+    ingest_delta(source_csv, store)
+
+    # nightly extract overlapping the rows already ingested
+    delta = tmp_path / "delta.csv"
+    pd.concat([
+        _complaints(0, 500, "2021-01-01", seed=1).tail(10),
+        _complaints(500, 25, "2021-03-01", seed=3),
+    ]).to_csv(delta, index=False)
+    assert ingest_delta(delta, store) == 25
+    assert read_counts(store, freq="M").sum() == 525
+
+
+def test_missing_products_are_counted_once(source_csv, tmp_path):
+    store = tmp_path / "store"
+    first = _complaints(0, 500, "2021-01-01", seed=1)
+    first.loc[::50, "product"] = np.nan
+    first.to_csv(source_csv, index=False)
+    ingest_delta(source_csv, store)
+
+    more = _complaints(500, 40, "2021-01-01", seed=2)     # same days as the first run
+    more.loc[::4, "product"] = np.nan
+    more.to_csv(source_csv, mode="a", header=False, index=False)
+    assert ingest_delta(source_csv, store) == 40
+
+    by_product = read_counts(store, freq="D", by="product")
+    assert by_product.values.sum() == 540
+    assert by_product["Unknown"].sum() == 10 + 10
+    assert read_counts(store, freq="M").sum() == 540
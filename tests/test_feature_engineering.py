@@ -0,0 +1,30 @@
+# tests/test_feature_engineering.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.feature_engineering import lag_matrix, series_to_supervised
+
+
+@pytest.mark.parametrize("lags, horizon", [(1, 1), (3, 1), (12, 1), (3, 4)])
+def test_lag_matrix_matches_series_to_supervised(lags, horizon):
+    series = pd.Series(np.random.default_rng(0).poisson(50, 60))
+    sup    = series_to_supervised(series, lags=lags, horizon=horizon).values
+
+    X, y = lag_matrix(series.values, lags, horizon)
+    assert X.shape == (len(sup), lags, 1)
+    np.testing.assert_array_equal(X, sup[:, 1:lags + 1].reshape(-1, lags, 1))
+    expected_y = sup[:, 0] if horizon == 1 else np.c_[sup[:, :1], sup[:, lags + 1:]]
+    np.testing.assert_array_equal(y, expected_y)
+
+
+def test_lag_matrix_panel_is_a_view():
+    panel = np.arange(40, dtype=float).reshape(4, 10)
+    X, y  = lag_matrix(panel, lags=3, horizon=2)
+    assert X.shape == (4, 6, 3, 1) and y.shape == (4, 6, 2)
+    assert np.shares_memory(X, panel) and np.shares_memory(y, panel)
+    for s in range(4):
+        Xs, ys = lag_matrix(panel[s], lags=3, horizon=2)
+        np.testing.assert_array_equal(X[s], Xs)
+        np.testing.assert_array_equal(y[s], ys)
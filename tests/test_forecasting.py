@@ -0,0 +1,41 @@
+# tests/test_forecasting.py
+
+import numpy as np
+import pytest
+
+from src.forecasting import lstm_direct_forecast, lstm_recursive_forecast
+
+tf = pytest.importorskip("tensorflow")
+
+
+def _lstm(n_lags, n_outputs=1):
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
+    tf.keras.utils.set_random_seed(0)
+    return Sequential([Input((n_lags, 1)), LSTM(8), Dense(n_outputs)])
+
+
+def test_batched_rollout_matches_predict_loop():
+    n_lags, horizon = 3, 5
+    model   = _lstm(n_lags)
+    history = np.array([3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]) / 10
+
+    # reference: one predict per step, lags ordered most recent first
+    window, expected = history[::-1][:n_lags].copy(), []
+    for _ in range(horizon):
+        yhat = model.predict(window.reshape(1, n_lags, 1), verbose=0)[0, 0]
+        expected.append(yhat)
+        window = np.r_[yhat, window[:-1]]
+
+    np.testing.assert_allclose(
+        lstm_recursive_forecast(model, history, n_lags, horizon), expected, rtol=1e-5
+    )
+    panel = lstm_recursive_forecast(model, np.vstack([history, history * 2]), n_lags, horizon)
+    assert panel.shape == (2, horizon)
+    np.testing.assert_allclose(panel[0], expected, rtol=1e-5)
+
+
+def test_direct_head_emits_whole_horizon():
+    model = _lstm(n_lags=4, n_outputs=6)
+    preds = lstm_direct_forecast(model, np.arange(10.0), n_lags=4)
+    assert preds.shape == (6,)
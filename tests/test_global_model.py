@@ -0,0 +1,45 @@
+# tests/test_global_model.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.batch_forecasting import FORECAST_COLUMNS
+from src.global_model import GlobalForecaster, forecast_global
+
+
+@pytest.fixture
+def counts():
+    rng   = np.random.default_rng(0)
+    index = pd.date_range("2016-01-31", periods=60, freq="ME")
+    t     = np.arange(len(index))
+    data  = {
+        name: level * (1 + 0.2 * np.sin(2 * np.pi * t / 12)) + rng.normal(0, level * 0.02, len(t))
+        for name, level in [("Mortgage", 1000), ("Credit card", 50), ("Student loan", 5)]
+    }
+    data["Student loan"][:20] = 0                 # product launched later
+    return pd.DataFrame(data, index=index)
+
+
+def test_windows_skip_leading_zeros_and_hold_out_validation(counts):
+    model = GlobalForecaster(n_lags=6, horizon=3)
+    start = np.array([0, 0, 20])
+    (tr_s, tr_t), (va_s, va_t) = model._index_pairs(np.zeros((3, 60)), start, val_periods=3)
+    assert (tr_t[tr_s == 2] >= 26).all()
+    assert (tr_t + 3 <= 57).all()
+    assert len(va_s) == 9 and set(va_t) == {55, 56, 57}
+
+
+def test_one_model_serves_every_series(counts):
+    train = counts.iloc[:-3]
+    model = GlobalForecaster(n_lags=6, horizon=3, units=8).fit(train, epochs=3)
+    preds = model.predict(train)
+    assert list(preds.columns) == list(counts.columns)
+    assert list(preds.index) == list(counts.index[-3:])
+    assert np.isfinite(preds.values).all()
+
+    out = forecast_global(counts, test_periods=3, n_lags=6, units=8,
+                          architecture="transformer")
+    assert list(out.columns) == FORECAST_COLUMNS
+    assert len(out) == 3 * counts.shape[1]
+    assert out["fit_seconds"].nunique() == 1
@@ -0,0 +1,78 @@
+# tests/test_hierarchical.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.hierarchical import TOTAL, build_hierarchy, hierarchical_forecast, reconcile
+
+
+def drift_forecast(train, horizon):
+    step = (train.iloc[-1] - train.iloc[0]) / max(len(train) - 1, 1)
+    return train.iloc[-1] + step * np.arange(1, horizon + 1)
+
+
+@pytest.fixture
+def complaints():
+    rng = np.random.default_rng(1)
+    dates = pd.to_datetime("2019-01-01") + pd.to_timedelta(
+        rng.integers(0, 3 * 365, size=3_000), unit="D"
+    )
+    return pd.DataFrame({
+        "product": rng.choice(["Credit card", "Mortgage"], len(dates)),
+        "state": rng.choice(["CA", "NY", "TX"], len(dates)),
+    }, index=pd.DatetimeIndex(dates, name="date_received")).sort_index()
+
+
+def test_hierarchy_aggregates_match_groupby(complaints):
+    hierarchy, counts = build_hierarchy(complaints, levels=["product", "state"])
+
+    assert hierarchy.S.shape == (1 + 2 + 6, 6)
+    assert hierarchy.nodes[:3] == [TOTAL, "Credit card", "Mortgage"]
+    monthly = complaints.resample("M").size()
+    assert (counts[TOTAL].values == monthly.values).all()
+    mortgage = complaints[complaints["product"] == "Mortgage"]
+    assert (counts["Mortgage / CA"].values
+            == mortgage[mortgage["state"] == "CA"].resample("M").size().values).all()
+
+
+def test_missing_keys_keep_totals_exact(complaints):
+    complaints = complaints.copy()
+    complaints.iloc[::10, complaints.columns.get_loc("state")] = np.nan
+    complaints.iloc[5::50, complaints.columns.get_loc("product")] = np.nan
+    complaints = complaints.astype("category")
+
+    hierarchy, counts = build_hierarchy(complaints, levels=["product", "state"])
+
+    assert (counts[TOTAL].values == complaints.resample("M").size().values).all()
+    assert "Mortgage / Unknown" in hierarchy.nodes and "Unknown" in hierarchy.nodes
+    mortgage = complaints[complaints["product"] == "Mortgage"]
+    assert (counts["Mortgage"].values == mortgage.resample("M").size().values).all()
+
+
+@pytest.mark.parametrize("method", ["ols", "wls_struct", "mint_shrink"])
+def test_reconciled_forecasts_are_coherent(complaints, method):
+    hierarchy, counts = build_hierarchy(complaints, levels=["product", "state"])
+    rng  = np.random.default_rng(2)
+    base = counts.iloc[-3:] + rng.normal(0, 5, size=(3, len(hierarchy.nodes)))
+    residuals = counts.diff().dropna()
+
+    tilde = reconcile(base, hierarchy, method, residuals=residuals)
+
+    assert np.allclose(tilde.values, hierarchy.aggregate(tilde[hierarchy.leaves]).values)
+    # already-coherent base forecasts are left unchanged
+    assert np.allclose(reconcile(counts.iloc[-3:], hierarchy, method, residuals).values,
+                       counts.iloc[-3:].values)
+
+
+def test_bottom_up_fits_only_leaves(complaints):
+    forecasts, summary = hierarchical_forecast(
+        complaints, levels=["product", "state"], models={"Drift": drift_forecast},
+        method="bottom_up", max_workers=1,
+    )
+
+    assert len(summary) == 6
+    assert forecasts["base"].isna().sum() == 3 * 3   # total + 2 products
+    total = forecasts[forecasts["series"] == TOTAL]["forecast"].values
+    leaves = forecasts[forecasts["level"] == "state"].groupby("date")["forecast"].sum().values
+    assert np.allclose(total, leaves)
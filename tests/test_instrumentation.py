@@ -0,0 +1,112 @@
+# tests/test_instrumentation.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import instrumentation
+from src.anomaly_detection import generate_panel_alerts
+from src.batch_forecasting import forecast_panel
+
+
+def naive_forecast(train, horizon):
+    return np.repeat(train.iloc[-1], horizon).astype(float)
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+
+
+def test_disabled_stage_is_a_shared_noop():
+    assert not instrumentation.is_enabled()
+    with instrumentation.stage("load", series="x") as rec:
+        rec["rows"] = 10
+    assert instrumentation.stage("other") is instrumentation.stage("load")
+    assert instrumentation.records() == []
+
+
+def test_stage_records_and_exports(enabled, tmp_path):
+    with instrumentation.stage("load") as rec:
+        rec["rows"] = 1234
+    for key in ["Mortgage", "Credit card"]:
+        with instrumentation.stage("forecast.ARIMA", series=key, rows=60):
+            sum(range(10_000))
+
+    df = instrumentation.to_frame()
+    assert list(df["stage"]) == ["load", "forecast.ARIMA", "forecast.ARIMA"]
+    assert df.loc[0, "rows"] == 1234
+    assert (df["wall_seconds"] >= 0).all() and (df["peak_rss_mb"] > 0).all()
+    assert instrumentation.summary().loc["forecast.ARIMA", "count"] == 2
+
+    instrumentation.export(str(tmp_path / "m.json"))
+    assert len(json.loads((tmp_path / "m.json").read_text())) == 3
+
+    instrumentation.export(str(tmp_path / "m.prom"))
+    prom = (tmp_path / "m.prom").read_text()
+    assert '# TYPE complaints_stage_wall_seconds gauge' in prom
+    assert 'complaints_stage_rows{stage="forecast.ARIMA",series="Mortgage"} 60' in prom
+
+
+def test_tracemalloc_capture_of_one_stage(tmp_path):
+    instrumentation.enable(profile_stage="fit", profile_mode="tracemalloc",
+                           profile_dir=str(tmp_path))
+    try:
+        with instrumentation.stage("fit", series="Mortgage"):
+            blob = [bytes(1000) for _ in range(1000)]
+        with instrumentation.stage("other"):
+            pass
+    finally:
+        instrumentation.disable()
+
+    fit, other = instrumentation.records()
+    assert fit["tags"]["traced_peak_mb"] > 0.9
+    assert open(fit["tags"]["profile"]).read()
+    assert "profile" not in other["tags"]
+    del blob
+
+
+def test_worker_records_are_merged(enabled):
+    dates  = pd.date_range("2020-01-31", periods=24, freq="M")
+    counts = pd.DataFrame({"a": np.arange(24), "b": np.arange(24) * 2}, index=dates)
+
+    forecast_panel(counts, models={"Naive": naive_forecast}, max_workers=2)
+
+    df = instrumentation.to_frame()
+    assert sorted(df.loc[df["stage"] == "forecast_series", "series"]) == ["a", "b"]
+
+
+def test_panel_alert_worker_records_are_merged(enabled):
+    dates = pd.date_range("2020-01-31", periods=36, freq="M")
+    wide  = pd.DataFrame({k: np.r_[np.full(18, 10.0), np.full(18, 50.0)] for k in "abcd"},
+                         index=dates)
+
+    generate_panel_alerts(wide, model="l2", pen=1, max_workers=2, batch_size=2)
+
+    df = instrumentation.to_frame()
+    assert sorted(df.loc[df["stage"] == "alerts.change_points", "series"]) == list("abcd")
+    assert df["pid"].nunique() > 1
+
+
+def test_peak_rss_without_resource_module(monkeypatch):
+    import builtins
+    real_import = builtins.__import__
+
+    def no_unix_modules(name, *args, **kwargs):
+        if name in ("resource", "psutil"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_unix_modules)
+    instrumentation.enable()
+    try:
+        with instrumentation.stage("load"):
+            pass
+    finally:
+        instrumentation.disable()
+    rec, = instrumentation.records()
+    assert rec["peak_rss_mb"] is None and rec["rss_growth_mb"] is None
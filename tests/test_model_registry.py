@@ -0,0 +1,99 @@
+# tests/test_model_registry.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.model_registry import ModelRegistry
+
+
+def _series(values):
+    return pd.Series(values, index=pd.date_range("2020-01-31", periods=len(values), freq="M"))
+
+
+def test_get_or_fit_caches_by_content(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    calls    = []
+
+    def fit():
+        calls.append(1)
+        return {"coef": 0.5}
+
+    train = _series(np.arange(12.0))
+    assert registry.get_or_fit("arima", train, fit, {"m": 12}) == {"coef": 0.5}
+    assert registry.get_or_fit("arima", train.copy(), fit, {"m": 12}) == {"coef": 0.5}
+    assert len(calls) == 1
+
+    # different data, hyperparameters or model type -> new fit
+    registry.get_or_fit("arima", _series(np.arange(13.0)), fit, {"m": 12})
+    registry.get_or_fit("arima", train, fit, {"m": 4})
+    registry.get_or_fit("prophet_like", train, fit, {"m": 12})
+    assert len(calls) == 4
+
+    meta = registry.metadata(registry.make_key("arima", train, {"m": 12}))
+    assert meta["n_obs"] == 12
+    assert meta["data_end"].startswith("2020-12-31")
+    assert meta["fit_seconds"] >= 0
+
+
+def test_lru_eviction(tmp_path):
+    registry = ModelRegistry(tmp_path, max_entries=2)
+    keys = []
+    for i in range(3):
+        keys.append(registry.make_key("m", np.array([i])))
+        registry.put(keys[-1], i, "m")
+        if i == 1:
+            registry.get(keys[0])    # touch the first entry so the second is LRU
+    assert registry.get(keys[1]) is None
+    assert registry.get(keys[0]) == 0
+    assert registry.get(keys[2]) == 2
+    assert len(registry.entries()) == 2
+
+
+def test_concurrent_put_and_evict_are_tolerated(tmp_path, monkeypatch):
+    registry = ModelRegistry(tmp_path)
+    assert registry.max_entries is not None and registry.max_bytes is not None
+
+    key = registry.make_key("m", np.array([1]))
+    registry.put(key, "first", "m")
+    registry.put(key, "second", "m")      # same content hash: already stored
+    assert registry.get(key) == "first"
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(".tmp")]
+
+    # an entry evicted between listing and reading is skipped / a miss
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda p: real_listdir(p) + ["gone"])
+    assert list(registry.entries()["key"]) == [key]
+    assert registry.get("gone") is None
+
+    # a half-evicted leftover (no metadata) is replaced by the next put
+    other = registry.make_key("m", np.array([2]))
+    os.makedirs(tmp_path / other)
+    registry.put(other, "fresh", "m")
+    assert registry.get(other) == "fresh"
+
+
+def _hit_repeatedly(root, key, n):
+    registry = ModelRegistry(root)
+    return sum(registry.get(key) == "model" for _ in range(n))
+
+
+def test_concurrent_hits_and_unreadable_metadata(tmp_path):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    registry = ModelRegistry(tmp_path)
+    key = registry.make_key("m", np.array([1]))
+    registry.put(key, "model", "m")
+
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("spawn")) as pool:
+        hits = list(pool.map(_hit_repeatedly, [str(tmp_path)] * 4, [key] * 4, [100] * 4))
+    assert hits == [100] * 4
+    assert sorted(os.listdir(tmp_path / key)) == ["meta.json", "model.pkl"]
+
+    # a torn meta.json is a miss, and the next put repairs the entry
+    (tmp_path / key / "meta.json").write_text('{"key": ')
+    assert registry.get(key) is None
+    registry.put(key, "model", "m")
+    assert registry.get(key) == "model"